@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for the Sales Assistant API server
+Run with: gunicorn -c examples/gunicorn_conf.py examples.server:app
+"""
+
+import multiprocessing
+
+# Async workers - one uvloop-backed event loop per worker process
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = (multiprocessing.cpu_count() * 2) + 1
+
+bind = "0.0.0.0:8000"
+
+# Recycle workers periodically to bound memory growth
+max_requests = 1000
+max_requests_jitter = 100
+
+timeout = 120
+keepalive = 5
@@ -0,0 +1,191 @@
+"""
+Sales Assistant API Server
+Async FastAPI interface around the orchestrator for non-Streamlit clients
+"""
+
+from typing import Dict, Any, Optional
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+import asyncio
+import orjson
+import secrets
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.orchestrator import SalesOrchestrator
+from src.sessions.manager import session_manager
+from src.utils.caching import TTLCache
+from src.utils.kb_references import get_references_dict_from_knowledge_sources
+
+# Installs uvloop as the loop policy when available
+from src.utils.event_loop import UVLOOP_ENABLED
+
+# Environment setup
+from dotenv import load_dotenv
+load_dotenv()
+
+# Default model for API usage
+DEFAULT_MODEL = "openai-gpt-4o-mini"
+
+# Short-lived cache for duplicate prompts (smoke tests, repeated clicks)
+# Keyed on (user_id, session_type, prompt); hits skip the LLM entirely
+RESPONSE_CACHE = TTLCache(maxsize=1024, ttl=60)
+
+
+class QueryRequest(BaseModel):
+    """Request body for the /query endpoint"""
+    query: str
+    user_id: str = "api-user"
+    session_type: str = "persistent"
+    user_context: Optional[Dict[str, Any]] = None
+
+
+def create_app() -> FastAPI:
+    """
+    Create and configure the FastAPI application
+
+    Handlers are async and await the orchestrator directly on the server's
+    event loop, so many LLM calls can be in flight concurrently on a
+    single worker process instead of blocking one thread per request.
+
+    Returns:
+        FastAPI: Configured application instance
+    """
+    # orjson serializes large response payloads several times faster than
+    # stdlib json and emits bytes directly
+    app = FastAPI(title="Sales Assistant API", default_response_class=ORJSONResponse)
+
+    # Shared orchestrator instance
+    orchestrator = SalesOrchestrator(
+        model_name=DEFAULT_MODEL,
+        enable_guardrails=True,
+        enable_tracing=False
+    )
+
+    @app.on_event("startup")
+    async def warm_data_sources():
+        """Pay data-source cold-start before the first user request"""
+        await orchestrator.warmup()
+
+    @app.post("/query")
+    async def query(body: QueryRequest):
+        """Process a user query and return the structured result"""
+        prompt = body.query.strip()
+        if not prompt:
+            return ORJSONResponse(
+                {"success": False, "error": "Missing 'query' field"},
+                status_code=400
+            )
+
+        query_id = secrets.token_hex(16)
+
+        # Serve recent duplicate prompts straight from the response cache
+        cache_key = (body.user_id, body.session_type, prompt)
+        cached = RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return ORJSONResponse({**cached, "query_id": query_id, "cached": True})
+
+        # Get session for conversation history
+        session = session_manager.get_session(body.user_id, body.session_type)
+
+        # Await directly - no thread handoff, no fresh event loop
+        result = await orchestrator.process_query(
+            prompt,
+            user_context=body.user_context,
+            session=session
+        )
+
+        # Presign cited documents on a worker thread while the rest of the
+        # response is assembled, instead of serially before serialization
+        refs_task = asyncio.create_task(asyncio.to_thread(
+            get_references_dict_from_knowledge_sources,
+            result.get("knowledge_sources", [])
+        ))
+
+        if not result["success"]:
+            # Failed turns are not persisted by the runner; record the
+            # user message and error outcome in one batched transaction
+            await session_manager.batch_append(
+                body.user_id,
+                [
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": result["response"]}
+                ],
+                session_type=body.session_type
+            )
+
+        payload = {
+            "query_id": query_id,
+            "success": result["success"],
+            "response": result["response"],
+            "tools_used": result.get("tools_used", []),
+            "execution_time": result.get("execution_time"),
+            "model": result.get("model")
+        }
+        payload["references"] = await refs_task
+
+        if result["success"]:
+            RESPONSE_CACHE.set(cache_key, payload)
+
+        status_code = 200 if result["success"] else 500
+        return ORJSONResponse(payload, status_code=status_code)
+
+    @app.get("/query/stream")
+    async def query_stream(
+        query: str,
+        user_id: str = "api-user",
+        session_type: str = "persistent"
+    ):
+        """
+        Stream a query response as Server-Sent Events
+
+        Tokens are forwarded as they leave the model, so clients see the
+        first bytes at LLM time-to-first-token instead of waiting for the
+        full answer to be buffered and serialized.
+        """
+        prompt = query.strip()
+        if not prompt:
+            return ORJSONResponse(
+                {"success": False, "error": "Missing 'query' parameter"},
+                status_code=400
+            )
+
+        session = session_manager.get_session(user_id, session_type)
+
+        async def event_stream():
+            async for delta in orchestrator.stream_query(prompt, session=session):
+                yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+
+    @app.get("/health")
+    async def health():
+        """Health check for the orchestrator and session manager"""
+        return {
+            "orchestrator": orchestrator.health_check(),
+            "active_sessions": len(session_manager.list_active_sessions()),
+            "uvloop": UVLOOP_ENABLED
+        }
+
+    return app
+
+
+app = create_app()
+
+
+# Local development entry point; production deployments should use
+# gunicorn with the config in examples/gunicorn_conf.py:
+#   gunicorn -c examples/gunicorn_conf.py examples.server:app
+if __name__ == "__main__":
+    import uvicorn
+    port = int(os.getenv("PORT", "8000"))
+    uvicorn.run(app, host="0.0.0.0", port=port)
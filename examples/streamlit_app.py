@@ -4,9 +4,9 @@ Production-ready web interface showcasing all system capabilities
 """
 
 import streamlit as st
-import asyncio
+import html
+import secrets
 import time
-import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional
 import sys
@@ -17,8 +17,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.agents.orchestrator import SalesOrchestrator
 from src.sessions.manager import session_manager
-from src.models.config import get_available_models, ModelProvider
+from src.models.config import (
+    get_available_models,
+    OPENAI_MODEL_NAMES,
+    BEDROCK_MODEL_NAMES
+)
 from src.knowledge.bedrock_kb import knowledge_base
+from src.utils.event_loop import run_sync
 from agents.exceptions import InputGuardrailTripwireTriggered
 
 # Environment setup
@@ -34,8 +39,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Static page fragments - built once at import so reruns only pay the
+# st.markdown dispatch cost, not multi-KB string construction
+_CSS = """
 <style>
 .main .block-container {
     padding-top: 2rem;
@@ -74,6 +80,27 @@ st.markdown("""
     border-left: 4px solid #667eea;
 }
 
+.chat-user {
+    background: #e9ecef;
+    border-radius: 10px;
+    padding: 10px;
+    margin: 10px 0;
+}
+
+.chat-error {
+    border-left: 3px solid #dc3545;
+    background: #f8d7da;
+    border-radius: 5px;
+    padding: 10px;
+    margin: 10px 0;
+}
+
+.chat-caption {
+    color: #6c757d;
+    font-size: 0.8em;
+    margin: 0 0 10px 0;
+}
+
 .guardrail-test {
     background: #f8f9fa;
     border: 2px dashed #dee2e6;
@@ -82,7 +109,143 @@ st.markdown("""
     margin: 1rem 0;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = """
+<div style='text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; margin-bottom: 2rem; color: white; box-shadow: 0 4px 20px rgba(102, 126, 234, 0.3);'>
+    <h1>🚀 Sales Assistant Agents</h1>
+    <p style='font-size: 1.1em; margin: 0;'>OpenAI Agents SDK | 🛡️ Security Guardrails | 🔧 Agents as Tools | 🌊 Streaming</p>
+</div>
+"""
+
+_WELCOME_HTML = """
+<div class='guardrail-test'>
+    <h2 style="color: #495057; text-align: center;">🔧 Sales Assistant Capabilities</h2>
+
+    <div style="text-align: left; max-width: 800px; margin: 0 auto;">
+        <h4 style="color: #28a745;">✅ Available Business Queries:</h4>
+        <ul>
+            <li><code>"What tests did Dr. Julie order?"</code> - Salesforce order data</li>
+            <li><code>"Who has Dr. Shafique contacted?"</code> - Veeva relationship data</li>
+            <li><code>"Analyze Dr. Julie's account comprehensively"</code> - Multi-tool analysis</li>
+            <li><code>"What are Guardant360 features?"</code> - Knowledge Base product info</li>
+            <li><code>"Show me analytics trends"</code> - Tableau business intelligence</li>
+            <li><code>"Dr. Julie's compliance status"</code> - Stark Law compliance</li>
+        </ul>
+
+        <h4 style="color: #dc3545;">🧪 Test Security Guardrails (Will be blocked):</h4>
+        <ul>
+            <li><code>"What is Dr. Julie's phone number?"</code> - PII protection</li>
+            <li><code>"What is 25 + 37?"</code> - Math problem filtering</li>
+            <li><code>"Tell me a joke"</code> - Inappropriate content blocking</li>
+        </ul>
+
+        <h4 style="color: #667eea;">🔧 Key Features:</h4>
+        <ul>
+            <li>✅ <strong>Agents as Tools</strong>: Parallel data source access</li>
+            <li>✅ <strong>Security Guardrails</strong>: PII protection & content filtering</li>
+            <li>✅ <strong>Multi-Model Support</strong>: OpenAI GPT-4o + Bedrock Claude</li>
+            <li>✅ <strong>Session Management</strong>: Persistent conversation history</li>
+            <li>✅ <strong>Real Data Sources</strong>: Salesforce, Veeva, Tableau, Knowledge Base</li>
+        </ul>
+    </div>
+</div>
+"""
+
+st.markdown(_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def _get_orchestrator(model_name: str) -> SalesOrchestrator:
+    """
+    Build (or reuse) the orchestrator for a model (cached per process)
+
+    SalesAssistantApp is reinstantiated on every rerun, so instance-level
+    caching never hit; st.cache_resource keeps one orchestrator per model
+    alive for the whole process instead of rebuilding each interaction.
+    """
+    return SalesOrchestrator(
+        model_name=model_name,
+        enable_guardrails=True,
+        enable_tracing=False
+    )
+
+
+@st.cache_data(max_entries=512)
+def _fmt_ts(ns: int) -> str:
+    """Format a nanosecond timestamp lazily (only when a message renders)"""
+    return datetime.fromtimestamp(ns / 1e9).isoformat(timespec='seconds')
+
+
+def _freeze_history(messages) -> tuple:
+    """Freeze chat messages into hashable (role, content, caption) tuples"""
+    frozen = []
+    for message in messages:
+        caption = None
+        if message['role'] == 'assistant' and 'metadata' in message:
+            metadata = message['metadata']
+            tools_text = ', '.join(metadata.get('tools_used', ['None']))
+            caption = (
+                f"⚡ {metadata.get('execution_time', 0):.2f}s | "
+                f"🤖 {metadata.get('model', 'Unknown')} | "
+                f"🔧 Tools: {tools_text} | "
+                f"💾 {metadata.get('session_type', 'Unknown')}"
+            )
+            if 'ts' in message:
+                caption += f" | 🕒 {_fmt_ts(message['ts'])}"
+        frozen.append((message['role'], message['content'], caption))
+    return tuple(frozen)
+
+
+def _message_html(role: str, content: str, caption: Optional[str]) -> str:
+    """Render a single frozen chat message as HTML"""
+    if role == 'user':
+        return f"<div class='chat-user'>🧑 {html.escape(content)}</div>"
+
+    if role == 'error':
+        return f"<div class='chat-error'>{html.escape(content)}</div>"
+
+    part = f"<div class='streaming-text'>{content}</div>"
+    if caption:
+        part += f"\n<div class='chat-caption'>{caption}</div>"
+    return part
+
+
+@st.cache_data(max_entries=4)
+def _history_html_cached(frozen: tuple) -> str:
+    """
+    Build the prior-turns HTML blob (memoized on the frozen history)
+
+    Streamlit ships one protobuf message to the browser per widget call,
+    so emitting chat_message/markdown/caption per row made long chats pay
+    hundreds of render messages on every rerun. One joined string keeps
+    it to a single st.markdown dispatch, and caching on the frozen tuple
+    means reruns that don't add a turn skip the string build entirely.
+    """
+    return "\n".join(_message_html(*message) for message in frozen)
+
+
+@st.cache_data(ttl=15)
+def _kb_health():
+    """Knowledge Base health (cached - may be a network round-trip)"""
+    return knowledge_base.health_check()
+
+
+@st.cache_data(ttl=5)
+def _active_sessions_count() -> int:
+    """Active session count (cached briefly to avoid per-rerun work)"""
+    return len(session_manager.list_active_sessions())
+
+
+@st.cache_data
+def _grouped_models():
+    """
+    Get available models grouped by provider (cached across reruns)
+
+    The provider grouping is precomputed at import time in
+    src.models.config; this helper just pairs it with the config dict.
+    """
+    return get_available_models(), OPENAI_MODEL_NAMES, BEDROCK_MODEL_NAMES
 
 
 class SalesAssistantApp:
@@ -99,7 +262,7 @@ class SalesAssistantApp:
     def _initialize_session_state(self):
         """Initialize Streamlit session state variables"""
         if 'user_id' not in st.session_state:
-            st.session_state.user_id = str(uuid.uuid4())[:8]
+            st.session_state.user_id = secrets.token_hex(4)
         
         if 'chat_history' not in st.session_state:
             st.session_state.chat_history = []
@@ -114,26 +277,17 @@ class SalesAssistantApp:
     
     def render_header(self):
         """Render the main application header"""
-        st.markdown("""
-        <div style='text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 15px; margin-bottom: 2rem; color: white; box-shadow: 0 4px 20px rgba(102, 126, 234, 0.3);'>
-            <h1>🚀 Sales Assistant Agents</h1>
-            <p style='font-size: 1.1em; margin: 0;'>OpenAI Agents SDK | 🛡️ Security Guardrails | 🔧 Agents as Tools | 🌊 Streaming</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     def render_sidebar(self) -> tuple:
         """Render sidebar configuration and return selected options"""
         with st.sidebar:
             st.markdown("### ⚙️ Configuration")
             
-            # Model selection
-            available_models = get_available_models()
+            # Model selection (cached - the registry is static)
+            available_models, openai_models, bedrock_models = _grouped_models()
             model_names = list(available_models.keys())
             
-            # Group models by provider for better UX
-            openai_models = [name for name in model_names if available_models[name].provider == ModelProvider.OPENAI]
-            bedrock_models = [name for name in model_names if available_models[name].provider == ModelProvider.BEDROCK]
-            
             st.markdown("**🤖 OpenAI Models:**")
             for model in openai_models:
                 st.markdown(f"• {available_models[model].display_name}")
@@ -165,10 +319,9 @@ class SalesAssistantApp:
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("🗑️ Clear Chat"):
-                    asyncio.run(session_manager.clear_session(st.session_state.user_id, session_type))
+                    run_sync(session_manager.clear_session(st.session_state.user_id, session_type))
                     st.session_state.chat_history = []
                     st.success("✅ Cleared!")
-                    st.experimental_rerun()
             
             with col2:
                 if st.button("📊 Reset Metrics"):
@@ -177,7 +330,6 @@ class SalesAssistantApp:
                         'guardrail_blocks': 0, 'total_time': 0.0
                     }
                     st.success("✅ Reset!")
-                    st.experimental_rerun()
             
             # Metrics display
             self.render_metrics()
@@ -219,16 +371,15 @@ class SalesAssistantApp:
         """Render system health status"""
         st.markdown("### 🏥 System Health")
         
-        # Knowledge Base status
-        kb_health = knowledge_base.health_check()
+        # Knowledge Base status (cached with a short TTL)
+        kb_health = _kb_health()
         if kb_health["available"]:
             st.success("✅ Knowledge Base: Connected")
         else:
             st.warning("⚠️ Knowledge Base: Mock Mode")
-        
+
         # Session manager
-        active_sessions = len(session_manager.list_active_sessions())
-        st.info(f"💾 Active Sessions: {active_sessions}")
+        st.info(f"💾 Active Sessions: {_active_sessions_count()}")
         
         # Model status
         if self.orchestrator:
@@ -264,90 +415,51 @@ class SalesAssistantApp:
     
     def initialize_orchestrator(self, model_name: str):
         """Initialize the orchestrator with selected model"""
-        if self.current_model != model_name:
-            with st.spinner(f"🔄 Initializing {model_name}..."):
-                try:
-                    self.orchestrator = SalesOrchestrator(
-                        model_name=model_name,
-                        enable_guardrails=True,
-                        enable_tracing=False
-                    )
-                    self.current_model = model_name
-                    st.success("✅ Agent initialized!")
-                    
-                except Exception as e:
-                    st.error(f"❌ Failed to initialize: {e}")
-                    print(f"❌ Initialization error: {e}")
-                    self.orchestrator = None
+        try:
+            self.orchestrator = _get_orchestrator(model_name)
+            self.current_model = model_name
+
+        except Exception as e:
+            st.error(f"❌ Failed to initialize: {e}")
+            print(f"❌ Initialization error: {e}")
+            self.orchestrator = None
     
     def render_welcome_message(self):
         """Render welcome message with capabilities"""
         if not st.session_state.chat_history:
-            st.markdown("""
-            <div class='guardrail-test'>
-                <h2 style="color: #495057; text-align: center;">🔧 Sales Assistant Capabilities</h2>
-                
-                <div style="text-align: left; max-width: 800px; margin: 0 auto;">
-                    <h4 style="color: #28a745;">✅ Available Business Queries:</h4>
-                    <ul>
-                        <li><code>"What tests did Dr. Julie order?"</code> - Salesforce order data</li>
-                        <li><code>"Who has Dr. Shafique contacted?"</code> - Veeva relationship data</li>
-                        <li><code>"Analyze Dr. Julie's account comprehensively"</code> - Multi-tool analysis</li>
-                        <li><code>"What are Guardant360 features?"</code> - Knowledge Base product info</li>
-                        <li><code>"Show me analytics trends"</code> - Tableau business intelligence</li>
-                        <li><code>"Dr. Julie's compliance status"</code> - Stark Law compliance</li>
-                    </ul>
-                    
-                    <h4 style="color: #dc3545;">🧪 Test Security Guardrails (Will be blocked):</h4>
-                    <ul>
-                        <li><code>"What is Dr. Julie's phone number?"</code> - PII protection</li>
-                        <li><code>"What is 25 + 37?"</code> - Math problem filtering</li> 
-                        <li><code>"Tell me a joke"</code> - Inappropriate content blocking</li>
-                    </ul>
-                    
-                    <h4 style="color: #667eea;">🔧 Key Features:</h4>
-                    <ul>
-                        <li>✅ <strong>Agents as Tools</strong>: Parallel data source access</li>
-                        <li>✅ <strong>Security Guardrails</strong>: PII protection & content filtering</li>
-                        <li>✅ <strong>Multi-Model Support</strong>: OpenAI GPT-4o + Bedrock Claude</li>
-                        <li>✅ <strong>Session Management</strong>: Persistent conversation history</li>
-                        <li>✅ <strong>Real Data Sources</strong>: Salesforce, Veeva, Tableau, Knowledge Base</li>
-                    </ul>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_WELCOME_HTML, unsafe_allow_html=True)
     
     def render_chat_interface(self, session_type: str):
         """Render the main chat interface"""
-        # Display chat history
-        for message in st.session_state.chat_history:
-            if message['role'] == 'user':
-                with st.chat_message("user"):
-                    st.write(message['content'])
-                    
-            elif message['role'] == 'assistant':
-                with st.chat_message("assistant"):
-                    st.markdown(f"<div class='streaming-text'>{message['content']}</div>", unsafe_allow_html=True)
-                    
-                    if 'metadata' in message:
-                        metadata = message['metadata']
-                        tools_text = ', '.join(metadata.get('tools_used', ['None']))
-                        
-                        st.caption(
-                            f"⚡ {metadata.get('execution_time', 0):.2f}s | "
-                            f"🤖 {metadata.get('model', 'Unknown')} | "
-                            f"🔧 Tools: {tools_text} | "
-                            f"💾 {metadata.get('session_type', 'Unknown')}"
-                        )
-                        
-            elif message['role'] == 'error':
-                with st.chat_message("assistant"):
-                    st.error(message['content'])
-        
+        # Display chat history as a single batched markdown call; all but
+        # the newest message come from the memoized blob, so appending a
+        # turn re-renders one message instead of the whole history
+        if st.session_state.chat_history:
+            frozen = _freeze_history(st.session_state.chat_history)
+            parts = [_history_html_cached(frozen[:-1]), _message_html(*frozen[-1])]
+            st.markdown("\n".join(filter(None, parts)), unsafe_allow_html=True)
+
+
         # Chat input
         if prompt := st.chat_input("🧪 Try: 'Who has Dr. Shafique contacted?' (new!) vs 'What is Dr. Julie's phone number?' (blocked)"):
             self.process_user_input(prompt, session_type)
     
+    def _update_metrics(self, successful_queries: int = 0, guardrail_blocks: int = 0, total_time: float = 0.0):
+        """
+        Record a query outcome with a single session-state assignment
+
+        Assigning one new metrics dict triggers one state diff per turn
+        instead of one per mutated counter.
+        """
+        metrics = st.session_state.metrics
+        st.session_state.metrics = {
+            **metrics,
+            'total_queries': metrics['total_queries'] + 1,
+            'successful_queries': metrics['successful_queries'] + successful_queries,
+            'guardrail_blocks': metrics['guardrail_blocks'] + guardrail_blocks,
+            'total_time': metrics['total_time'] + total_time
+        }
+
     def process_user_input(self, prompt: str, session_type: str):
         """Process user input and generate response"""
         if not self.orchestrator:
@@ -358,7 +470,7 @@ class SalesAssistantApp:
         st.session_state.chat_history.append({
             'role': 'user',
             'content': prompt,
-            'timestamp': datetime.now().isoformat()
+            'ts': time.time_ns()
         })
         
         # Display user message
@@ -375,8 +487,8 @@ class SalesAssistantApp:
                         session_type
                     )
                     
-                    # Process query
-                    result = asyncio.run(self.orchestrator.process_query(
+                    # Process query on the shared background loop
+                    result = run_sync(self.orchestrator.process_query(
                         prompt,
                         user_context={
                             "name": "Sales Representative",
@@ -391,15 +503,16 @@ class SalesAssistantApp:
                         st.markdown(f"<div class='streaming-text'>{result['response']}</div>", unsafe_allow_html=True)
                         
                         # Update metrics
-                        st.session_state.metrics['total_queries'] += 1
-                        st.session_state.metrics['successful_queries'] += 1
-                        st.session_state.metrics['total_time'] += result['execution_time']
+                        self._update_metrics(
+                            successful_queries=1,
+                            total_time=result['execution_time']
+                        )
                         
                         # Add to chat history
                         st.session_state.chat_history.append({
                             'role': 'assistant',
                             'content': result['response'],
-                            'timestamp': datetime.now().isoformat(),
+                            'ts': time.time_ns(),
                             'metadata': {
                                 'execution_time': result['execution_time'],
                                 'tools_used': result.get('tools_used', []),
@@ -413,15 +526,15 @@ class SalesAssistantApp:
                         st.error(result['response'])
                         
                         # Update metrics
-                        st.session_state.metrics['total_queries'] += 1
-                        if "Guardrail" in result['response']:
-                            st.session_state.metrics['guardrail_blocks'] += 1
+                        self._update_metrics(
+                            guardrail_blocks=1 if "Guardrail" in result['response'] else 0
+                        )
                         
                         # Add to chat history
                         st.session_state.chat_history.append({
                             'role': 'error',
                             'content': result['response'],
-                            'timestamp': datetime.now().isoformat()
+                            'ts': time.time_ns()
                         })
                 
                 except InputGuardrailTripwireTriggered as e:
@@ -429,14 +542,13 @@ class SalesAssistantApp:
                     st.error(error_msg)
                     
                     # Update metrics
-                    st.session_state.metrics['total_queries'] += 1
-                    st.session_state.metrics['guardrail_blocks'] += 1
+                    self._update_metrics(guardrail_blocks=1)
                     
                     # Add to chat history
                     st.session_state.chat_history.append({
                         'role': 'error',
                         'content': error_msg,
-                        'timestamp': datetime.now().isoformat()
+                        'ts': time.time_ns()
                     })
                 
                 except Exception as e:
@@ -444,17 +556,14 @@ class SalesAssistantApp:
                     st.error(error_msg)
                     
                     # Update metrics
-                    st.session_state.metrics['total_queries'] += 1
-                    
+                    self._update_metrics()
+
                     # Add to chat history
                     st.session_state.chat_history.append({
-                        'role': 'error', 
+                        'role': 'error',
                         'content': error_msg,
-                        'timestamp': datetime.now().isoformat()
+                        'ts': time.time_ns()
                     })
-        
-        # Rerun to update the interface
-        st.experimental_rerun()
     
     def run(self):
         """Main application runner"""
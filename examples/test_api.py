@@ -0,0 +1,75 @@
+"""
+API smoke test - exercises the FastAPI server's health and query endpoints
+Uses one pooled requests.Session so repeated calls reuse warm TCP
+connections instead of paying socket setup per request
+"""
+
+import os
+import sys
+from time import perf_counter
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = os.getenv("CONCIERGE_API_URL", "http://localhost:8000")
+
+# One session for the whole run - keepalive pooling amortizes the
+# TCP/TLS handshake across every call below
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+
+def get_health() -> dict:
+    """Fetch the /health payload"""
+    response = _session.get(f"{BASE_URL}/health", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def query_api(query: str, user_id: str = "api-test-user") -> dict:
+    """Send a query through /query and return the structured result"""
+    response = _session.post(
+        f"{BASE_URL}/query",
+        json={"query": query, "user_id": user_id},
+        timeout=120
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def main() -> int:
+    """Run the smoke test: one health check, then a few timed queries"""
+    print(f"🧪 Smoke-testing API at {BASE_URL}")
+
+    try:
+        health = get_health()
+    except requests.RequestException as e:
+        print(f"❌ Health check failed: {e}")
+        return 1
+    print(f"✅ Health: {health}")
+
+    test_queries = [
+        "What is Guardant360?",
+        "Show me order status for Dr. Sarah Johnson",
+        "What is Guardant360?",  # repeat - should hit the response cache
+    ]
+
+    for query in test_queries:
+        start = perf_counter()
+        try:
+            result = query_api(query)
+        except requests.RequestException as e:
+            print(f"❌ Query failed ({query!r}): {e}")
+            return 1
+        elapsed = perf_counter() - start
+        status = "✅" if result.get("success") else "⚠️"
+        print(f"{status} {elapsed:.2f}s - {query}")
+
+    print("🎉 Smoke test complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@ Sales Orchestrator Agent - Main agent with all business tools
 Implements the "agents as tools" pattern for optimal performance and modularity
 """
 
+import asyncio
+from time import perf_counter
 from typing import Dict, Any, Optional, List
 from agents import Agent, Runner, ModelSettings
 from agents.extensions.models.litellm_model import LitellmModel
@@ -10,17 +12,82 @@ from agents.extensions.models.litellm_model import LitellmModel
 # Import tools and guardrails
 from .tools import (
     query_salesforce_tool,
-    query_veeva_tool, 
+    query_veeva_tool,
     query_knowledge_tool,
     query_tableau_tool,
     query_compliance_tool,
+    batch_query_tool,
     SalesContext
 )
+from ..data.salesforce import salesforce_data
+from ..data.veeva import veeva_data
+from ..data.tableau import tableau_data
+from ..knowledge.bedrock_kb import knowledge_base, begin_source_capture
 from ..guardrails.security import strict_security_guardrail
 from ..models.config import get_model_config, get_model_settings
 from ..sessions.manager import SessionManager
 
 
+
+# Orchestrator system prompt, built once at import instead of per-agent
+ORCHESTRATOR_INSTRUCTIONS = """
+            🎯 **You are a comprehensive sales assistant with access to all enterprise data sources.**
+            
+            🔧 **AVAILABLE TOOLS & USAGE:**
+            
+            **query_salesforce_tool**: Order data, customer information, compliance
+            • Use for: "What orders did Dr. X place?", "Show me order status", "Compliance information"
+            • Returns: Structured order information, totals, recent activity
+            
+            **query_veeva_tool**: Healthcare professional engagements and relationships
+            • Use for: "Who has Dr. X contacted?", "Latest engagement with Dr. Y", "Talking points"
+            • Returns: Engagement history, contact relationships, meeting outcomes
+            
+            **query_knowledge_tool**: Product information, training materials, clinical data
+            • Use for: "Guardant360 features", "Product specifications", "Clinical studies"
+            • Returns: Detailed product information and training resources
+            
+            **query_tableau_tool**: Business analytics, trends, performance metrics
+            • Use for: "Show me analytics", "Performance trends", "Regional data"
+            • Returns: Formatted analytics reports and business insights
+            
+            **query_compliance_tool**: Stark Law compliance, risk assessment
+            • Use for: "Compliance status for Dr. X", "Spending limits", "Risk assessment"
+            • Returns: Detailed compliance information and recommendations
+
+            **batch_query_tool**: Run several of the above tools in ONE call
+            • Use for: Comprehensive/multi-source questions ("Analyze Dr. X's account comprehensively")
+            • Pass a list of {tool, argument} pairs; all tools run concurrently
+            • Returns: Combined results with one labeled section per tool
+            
+            📊 **INTELLIGENT TOOL STRATEGY:**
+            • **Single queries**: Use the most relevant tool
+            • **Complex questions**: Use MULTIPLE tools and synthesize results
+            • **"Who has Dr. X contacted?"**: Use query_veeva_tool (business relationship data)
+            • **Comprehensive analysis**: Combine Salesforce + Veeva + Tableau data
+            
+            ✅ **RESPONSE GUIDELINES:**
+            • Provide specific, actionable insights
+            • Reference actual data from tools
+            • Be professional and business-focused
+            • Format responses clearly with bullet points and sections
+            • Always mention which data sources were consulted
+            
+            ❌ **RESTRICTIONS:**
+            • Never share personal contact information (phone, email, SSN)
+            • Don't attempt math calculations or tell jokes
+            • Stay focused on legitimate business inquiries
+            • Don't guess - use tools to get accurate data
+            
+            🎯 **MISSION**: Help sales representatives make data-driven decisions and build stronger customer relationships.
+            """
+
+
+# Shared Agent instances keyed by (model_name, enable_guardrails) - the
+# agent is configuration plus tool schemas, all immutable after build
+_AGENT_CACHE: Dict[tuple, Agent] = {}
+
+
 class SalesOrchestrator:
     """
     Main orchestrator for the sales assistant system
@@ -63,92 +130,82 @@ class SalesOrchestrator:
     
     def _create_orchestrator_agent(self) -> Agent:
         """Create the main orchestrator agent with all tools"""
-        
+
+        # Agent construction introspects every tool signature and Pydantic
+        # model to build JSON schemas, so reuse one Agent per configuration
+        # instead of paying that on each orchestrator init
+        cache_key = (self.model_name, self.enable_guardrails)
+        agent = _AGENT_CACHE.get(cache_key)
+        if agent is not None:
+            return agent
+
         # Prepare guardrails
         guardrails = [strict_security_guardrail] if self.enable_guardrails else []
-        
+
         # Create the agent
         agent = Agent(
             name="Sales Assistant Orchestrator",
-            instructions="""
-            🎯 **You are a comprehensive sales assistant with access to all enterprise data sources.**
-            
-            🔧 **AVAILABLE TOOLS & USAGE:**
-            
-            **query_salesforce_tool**: Order data, customer information, compliance
-            • Use for: "What orders did Dr. X place?", "Show me order status", "Compliance information"
-            • Returns: Structured order information, totals, recent activity
-            
-            **query_veeva_tool**: Healthcare professional engagements and relationships
-            • Use for: "Who has Dr. X contacted?", "Latest engagement with Dr. Y", "Talking points"
-            • Returns: Engagement history, contact relationships, meeting outcomes
-            
-            **query_knowledge_tool**: Product information, training materials, clinical data
-            • Use for: "Guardant360 features", "Product specifications", "Clinical studies"
-            • Returns: Detailed product information and training resources
-            
-            **query_tableau_tool**: Business analytics, trends, performance metrics
-            • Use for: "Show me analytics", "Performance trends", "Regional data"
-            • Returns: Formatted analytics reports and business insights
-            
-            **query_compliance_tool**: Stark Law compliance, risk assessment
-            • Use for: "Compliance status for Dr. X", "Spending limits", "Risk assessment"
-            • Returns: Detailed compliance information and recommendations
-            
-            📊 **INTELLIGENT TOOL STRATEGY:**
-            • **Single queries**: Use the most relevant tool
-            • **Complex questions**: Use MULTIPLE tools and synthesize results
-            • **"Who has Dr. X contacted?"**: Use query_veeva_tool (business relationship data)
-            • **Comprehensive analysis**: Combine Salesforce + Veeva + Tableau data
-            
-            ✅ **RESPONSE GUIDELINES:**
-            • Provide specific, actionable insights
-            • Reference actual data from tools
-            • Be professional and business-focused
-            • Format responses clearly with bullet points and sections
-            • Always mention which data sources were consulted
-            
-            ❌ **RESTRICTIONS:**
-            • Never share personal contact information (phone, email, SSN)
-            • Don't attempt math calculations or tell jokes
-            • Stay focused on legitimate business inquiries
-            • Don't guess - use tools to get accurate data
-            
-            🎯 **MISSION**: Help sales representatives make data-driven decisions and build stronger customer relationships.
-            """,
+            instructions=ORCHESTRATOR_INSTRUCTIONS,
             tools=[
                 query_salesforce_tool,
                 query_veeva_tool,
                 query_knowledge_tool,
                 query_tableau_tool,
-                query_compliance_tool
+                query_compliance_tool,
+                batch_query_tool
             ],
             input_guardrails=guardrails,
             model=self.model_config.model_id,
             model_settings=get_model_settings(self.model_config)
         )
-        
+
+        _AGENT_CACHE[cache_key] = agent
         return agent
     
+    async def warmup(self) -> None:
+        """
+        Warm the data-source clients before the first user query
+
+        Touches each backing source once so TLS handshakes, credential
+        resolution and client setup happen off the user-visible critical
+        path. Intended to be awaited at server startup; failures are
+        swallowed so a cold source never blocks serving.
+        """
+        warmup_calls = (
+            asyncio.to_thread(salesforce_data.get_order_summary),
+            asyncio.to_thread(veeva_data.get_latest_engagement, "warmup"),
+            asyncio.to_thread(tableau_data.get_analytics_summary),
+            asyncio.to_thread(knowledge_base.warmup),
+        )
+        await asyncio.gather(*warmup_calls, return_exceptions=True)
+
     async def process_query(
         self,
         query: str,
         user_context: Optional[Dict[str, Any]] = None,
-        session = None
+        session = None,
+        include_result_object: bool = False
     ) -> Dict[str, Any]:
         """
         Process a user query and return structured results
-        
+
         Args:
             query: User question or request
             user_context: Optional user context (name, territory, role)
             session: Optional session for conversation history
-            
+            include_result_object: Also return the full SDK result object;
+                off by default so callers don't pin the whole run trace
+
         Returns:
             Dict containing response, metadata, and execution info
         """
-        import time
-        start_time = time.time()
+        # perf_counter is monotonic and not subject to wall-clock
+        # adjustments, and hoisting the import keeps it off the hot path
+        start_time = perf_counter()
+
+        # Fresh per-request citation list - tool calls spawned by this run
+        # record into it, so concurrent requests cannot swap references
+        cited_sources = begin_source_capture()
         
         try:
             # Create sales context
@@ -162,23 +219,26 @@ class SalesOrchestrator:
                 session=session
             )
             
-            end_time = time.time()
+            end_time = perf_counter()
             
             # Extract tool usage information
             tools_used = self._extract_tools_used(result)
             
-            return {
+            response = {
                 "success": True,
                 "response": result.final_output,
                 "tools_used": tools_used,
                 "execution_time": end_time - start_time,
                 "model": self.model_config.display_name,
                 "session_used": session is not None,
-                "result_object": result  # Full result object for advanced usage
+                "knowledge_sources": list(cited_sources)
             }
+            if include_result_object:
+                response["result_object"] = result  # Full result object for advanced usage
+            return response
             
         except Exception as e:
-            end_time = time.time()
+            end_time = perf_counter()
             return {
                 "success": False,
                 "response": f"❌ **Error**: {str(e)}",
@@ -191,25 +251,28 @@ class SalesOrchestrator:
         self,
         query: str,
         user_context: Optional[Dict[str, Any]] = None,
-        session = None
+        session = None,
+        include_tool_progress: bool = False
     ):
         """
         Process a query with streaming response
-        
+
         Args:
             query: User question or request
             user_context: Optional user context
             session: Optional session for conversation history
-            
+            include_tool_progress: Also yield tool start/finish markers as
+                they happen, so clients show progress during long tool runs
+
         Yields:
             Response chunks as they become available
         """
         from openai.types.responses import ResponseTextDeltaEvent
-        
+
         try:
             # Create sales context
             context = self._create_sales_context(user_context)
-            
+
             # Run with streaming
             result = Runner.run_streamed(
                 self.agent,
@@ -217,11 +280,18 @@ class SalesOrchestrator:
                 context=context,
                 session=session
             )
-            
+
             async for event in result.stream_events():
                 if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
                     yield event.data.delta
-                    
+                elif include_tool_progress and event.type == "run_item_stream_event":
+                    # Surface tool lifecycle as soon as the runner emits it
+                    # instead of leaving the client silent until final text
+                    if event.item.type == "tool_call_item":
+                        yield "\n🔧 Consulting data sources...\n"
+                    elif event.item.type == "tool_call_output_item":
+                        yield "\n✅ Data retrieved, composing answer...\n"
+
         except Exception as e:
             yield f"❌ **Streaming Error**: {str(e)}"
     
@@ -238,15 +308,12 @@ class SalesOrchestrator:
     
     def _extract_tools_used(self, result) -> List[str]:
         """Extract which tools were used from the result"""
-        tools_used = []
-        
-        for item in result.new_items:
-            if hasattr(item, 'tool_name') and item.tool_name:
-                tool_name = item.tool_name
-                if tool_name not in tools_used:
-                    tools_used.append(tool_name)
-        
-        return tools_used
+        # Single pass with dict-based dedup - keeps first-use order without
+        # the quadratic "not in list" scans on long tool traces
+        return list(dict.fromkeys(
+            tool_name for item in result.new_items
+            if (tool_name := getattr(item, 'tool_name', None))
+        ))
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the current model configuration"""
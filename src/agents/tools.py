@@ -6,12 +6,135 @@ Implements @function_tool decorated functions for Salesforce, Veeva, Tableau, an
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
 from agents import function_tool, RunContextWrapper
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Import data sources
 from ..data.salesforce import salesforce_data
-from ..data.veeva import veeva_data  
+from ..data.veeva import veeva_data
 from ..data.tableau import tableau_data
-from ..knowledge.bedrock_kb import knowledge_base
+from ..knowledge.bedrock_kb import knowledge_base, record_cited_sources
+from ..utils.caching import TTLCache
+
+# orjson encodes roughly an order of magnitude faster than stdlib json;
+# fall back quietly when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _dump_model_json(model: BaseModel) -> str:
+    """Serialize a tool result model to indented JSON"""
+    if orjson is not None:
+        return orjson.dumps(model.model_dump(), option=orjson.OPT_INDENT_2).decode()
+    return model.model_dump_json(indent=2)
+
+
+# Memoizes tool results keyed by (tool name, normalized args) so the
+# agent re-asking the same question within a conversation returns in a
+# dict lookup instead of re-hitting the backing data source
+_TOOL_CACHE = TTLCache(maxsize=256, ttl=300)
+
+
+# Bounds on outbound data-source traffic: at most 8 concurrent backend
+# calls, and at most 10 new calls per second across all conversations
+_OUTBOUND_SEMAPHORE = asyncio.Semaphore(8)
+
+
+# Dedicated pool for blocking knowledge-base calls, sized to match the
+# semaphore - keeps long Bedrock queries from starving the default
+# executor that to_thread shares with everything else in the process
+_KB_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="kb-query")
+
+
+class _RateLimiter:
+    """Simple token-bucket limiter for outbound tool calls"""
+
+    def __init__(self, rate: float = 10.0, per: float = 1.0):
+        self.rate = rate
+        self.per = per
+        self._tokens = rate
+        self._updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a call token is available"""
+        # Sleeping while holding the lock is deliberate: throttled
+        # acquirers queue up FIFO behind the sleeper instead of racing
+        # for the next token when it becomes available
+        async with self._lock:
+            now = time.monotonic()
+            if self._updated is not None:
+                self._tokens = min(
+                    self.rate,
+                    self._tokens + (now - self._updated) * (self.rate / self.per)
+                )
+            self._updated = now
+
+            if self._tokens < 1:
+                wait = (1 - self._tokens) * (self.per / self.rate)
+                await asyncio.sleep(wait)
+                self._updated = time.monotonic()
+                self._tokens = 0
+            else:
+                self._tokens -= 1
+
+
+_OUTBOUND_RATE_LIMITER = _RateLimiter(rate=10.0, per=1.0)
+
+
+def _cache_key(tool_name: str, *args) -> tuple:
+    """Build a cache key from a tool name and normalized arguments"""
+    return (tool_name,) + tuple(
+        arg.strip().lower() if isinstance(arg, str) else arg
+        for arg in args
+    )
+
+
+# In-flight calls by cache key, so concurrent identical invocations
+# await one computation instead of racing to hit the backend
+_INFLIGHT: Dict[tuple, asyncio.Future] = {}
+
+
+def _singleflight(func):
+    """Coalesce concurrent identical calls to one awaited computation"""
+    @functools.wraps(func)
+    async def wrapper(*args):
+        key = _cache_key(func.__name__, *args)
+
+        # No lock needed: the dict is only touched from the event loop,
+        # with no await between the lookup and the insert
+        existing = _INFLIGHT.get(key)
+        if existing is not None:
+            return await asyncio.shield(existing)
+
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT[key] = future
+        try:
+            result = await func(*args)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else awaits
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # Cancellation of the leader (client disconnect, guardrail
+            # tripwire) bypasses both branches above - cancel the future
+            # so coalesced followers are released instead of hanging on
+            # a result that will never arrive
+            if not future.done():
+                future.cancel()
+            _INFLIGHT.pop(key, None)
+
+    return wrapper
 
 
 # Data models for structured responses
@@ -34,6 +157,12 @@ class EngagementInfo(BaseModel):
     contacts_made: List[Dict[str, Any]]
 
 
+class BatchToolRequest(BaseModel):
+    """One tool invocation inside a batch_query_tool call"""
+    tool: str
+    argument: Optional[str] = None
+
+
 # Context class for sharing data between tools
 class SalesContext:
     """Sales context shared across all tools"""
@@ -43,6 +172,195 @@ class SalesContext:
         self.user_role = user_role
 
 
+# Plain implementation helpers - callable both from the decorated tools
+# and from batch_query_tool, which cannot invoke FunctionTool objects
+@_singleflight
+async def _query_salesforce_impl(doctor_name: Optional[str] = None) -> OrderInfo:
+    """Fetch the Salesforce order summary for a doctor (or all doctors)"""
+    cache_key = _cache_key("query_salesforce_tool", doctor_name)
+    cached = _TOOL_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Get order summary from data source
+    order_summary = salesforce_data.get_order_summary(doctor_name)
+
+    # model_construct skips field validation - the summary comes from our
+    # own data layer with known-good types, so validating it is pure cost
+    result = OrderInfo.model_construct(
+        doctor=order_summary["doctor"],
+        total_orders=order_summary["total_orders"],
+        total_value=order_summary["total_value"],
+        recent_orders=order_summary["recent_orders"],
+        status_summary=order_summary["status_summary"]
+    )
+    _TOOL_CACHE.set(cache_key, result)
+    return result
+
+
+@_singleflight
+async def _query_veeva_impl(doctor_name: str) -> EngagementInfo:
+    """Fetch the latest Veeva engagement for a doctor"""
+    cache_key = _cache_key("query_veeva_tool", doctor_name)
+    cached = _TOOL_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Get latest engagement info from data source
+    engagement_info = veeva_data.get_latest_engagement(doctor_name)
+
+    result = EngagementInfo.model_construct(
+        doctor=engagement_info["doctor"],
+        last_engagement_date=engagement_info["last_engagement_date"],
+        engagement_type=engagement_info["engagement_type"],
+        outcome=engagement_info["outcome"],
+        talking_points=engagement_info["talking_points"],
+        contacts_made=engagement_info["contacts_made"]
+    )
+    _TOOL_CACHE.set(cache_key, result)
+    return result
+
+
+@_singleflight
+async def _query_knowledge_fetch(query: str) -> tuple:
+    """Fetch (answer, cited sources) for a KB query, cached and coalesced"""
+    cache_key = _cache_key("query_knowledge_tool", query)
+    cached = _TOOL_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Query the knowledge base on a worker thread - the boto3 call blocks,
+    # and parking it on the loop would stall every other in-flight tool.
+    # The semaphore and limiter keep a burst of conversations from
+    # saturating the backend or tripping provider throttling
+    async with _OUTBOUND_SEMAPHORE:
+        await _OUTBOUND_RATE_LIMITER.acquire()
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            _KB_EXECUTOR, knowledge_base.query_with_sources, query
+        )
+
+    text = result["answer"]
+    sources = tuple(result["sources"])
+    _TOOL_CACHE.set(cache_key, (text, sources))
+    return text, sources
+
+
+async def _query_knowledge_impl(query: str) -> str:
+    """Query the Knowledge Base for product/training information"""
+    text, sources = await _query_knowledge_fetch(query)
+
+    # Record citations per caller, outside the singleflighted fetch -
+    # a coalesced follower gets the leader's (text, sources) back and
+    # must land the sources in its own request's capture list, exactly
+    # like a cache hit does
+    record_cited_sources(sources)
+    return text
+
+
+@_singleflight
+async def _query_tableau_impl(analysis_type: str = "trends") -> str:
+    """Build the requested Tableau analytics report"""
+    cache_key = _cache_key("query_tableau_tool", analysis_type)
+    cached = _TOOL_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if analysis_type.lower() == "insights":
+        insights = tableau_data.get_performance_insights()
+        result = "\n".join([f"• {insight}" for insight in insights])
+    elif analysis_type.lower() == "regional":
+        regions = tableau_data.get_regional_performance()
+        parts = ["🌎 Regional Performance Summary:\n"]
+        parts.extend(_REGION_TEMPLATE.format(**region) for region in regions)
+        result = "\n".join(parts) + "\n"
+    else:
+        # Default to trends analysis
+        result = tableau_data.get_analytics_summary()
+
+    _TOOL_CACHE.set(cache_key, result)
+    return result
+
+
+@_singleflight
+async def _query_compliance_impl(doctor_name: str) -> str:
+    """Build the Stark Law compliance report for a doctor"""
+    cache_key = _cache_key("query_compliance_tool", doctor_name)
+    cached = _TOOL_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    compliance_info = salesforce_data.get_compliance_info(doctor_name)
+
+    if not compliance_info:
+        return f"No compliance data available for {doctor_name}"
+
+    compliance = compliance_info[0]  # Get first (should be only) result
+
+    parts = [_COMPLIANCE_TEMPLATE.format(**compliance)]
+
+    # Add recommendations based on risk level
+    parts.append(_RISK_BLOCKS.get(compliance['risk_level'], _RISK_BLOCKS["Low"]))
+
+    result = "\n".join(parts)
+    _TOOL_CACHE.set(cache_key, result)
+    return result
+
+
+# Recommendation blocks per risk level, built once at import so the
+# compliance tool does a single dict lookup instead of branching into
+# per-call string construction
+_RISK_BLOCKS = {
+    "High": (
+        "⚠️ **Recommendations:**\n"
+        "• Monitor spending closely\n"
+        "• Consider alternative engagement strategies\n"
+        "• Consult compliance team before additional activities\n"
+    ),
+    "Medium": (
+        "📊 **Recommendations:**\n"
+        "• Regular monitoring recommended\n"
+        "• Plan remaining activities carefully\n"
+    ),
+    "Low": (
+        "✅ **Status:**\n"
+        "• Compliance status is healthy\n"
+        "• Continue with planned activities\n"
+    ),
+}
+
+
+# Report templates, built once at import - formatting into a template and
+# joining a list is cheaper than growing a string with repeated +=
+_REGION_TEMPLATE = (
+    "**{region}:**\n"
+    "• Orders: {total_orders:,}\n"
+    "• Revenue: ${revenue:,}\n"
+    "• Growth: {growth}\n"
+    "• Key Accounts: {key_accounts}\n"
+)
+
+_COMPLIANCE_TEMPLATE = (
+    "**Stark Law Compliance - {doctor}:**\n\n"
+    "• Annual Limit: ${annual_limit:,}\n"
+    "• Current Spent: ${current_spent:,}\n"
+    "• Remaining Budget: ${remaining:,}\n"
+    "• Utilization: {percentage_used:.1f}%\n"
+    "• Risk Level: {risk_level}\n"
+    "• Last Updated: {last_updated}\n"
+)
+
+
+# Dispatch table for batch_query_tool
+_BATCH_DISPATCH = {
+    "query_salesforce_tool": _query_salesforce_impl,
+    "query_veeva_tool": _query_veeva_impl,
+    "query_knowledge_tool": _query_knowledge_impl,
+    "query_tableau_tool": _query_tableau_impl,
+    "query_compliance_tool": _query_compliance_impl,
+}
+
+
 @function_tool
 async def query_salesforce_tool(
     ctx: RunContextWrapper[SalesContext],
@@ -50,31 +368,21 @@ async def query_salesforce_tool(
 ) -> OrderInfo:
     """
     🔧 Salesforce Tool: Query doctor orders and compliance information
-    
+
     This tool retrieves order information from Salesforce CRM, including:
     - Order history and status
     - Financial totals and summaries
     - Recent order activity
     - Stark Law compliance data (when applicable)
-    
+
     Args:
         doctor_name: Specific doctor name to filter orders (optional)
-        
+
     Returns:
         OrderInfo: Structured order and compliance information
     """
-    print(f"🔧 Salesforce Tool Called: doctor={doctor_name}")
-    
-    # Get order summary from data source
-    order_summary = salesforce_data.get_order_summary(doctor_name)
-    
-    return OrderInfo(
-        doctor=order_summary["doctor"],
-        total_orders=order_summary["total_orders"],
-        total_value=order_summary["total_value"],
-        recent_orders=order_summary["recent_orders"],
-        status_summary=order_summary["status_summary"]
-    )
+    logger.debug("🔧 Salesforce Tool Called: doctor=%s", doctor_name)
+    return await _query_salesforce_impl(doctor_name)
 
 
 @function_tool
@@ -84,32 +392,21 @@ async def query_veeva_tool(
 ) -> EngagementInfo:
     """
     🔧 Veeva Tool: Query healthcare professional engagement data
-    
+
     This tool retrieves engagement information from Veeva CRM, including:
     - Latest engagement activities
     - Talking points and outcomes
     - Contact information and relationship mapping
     - Next steps and follow-up plans
-    
+
     Args:
         doctor_name: Name of the healthcare professional
-        
+
     Returns:
         EngagementInfo: Structured engagement and contact information
     """
-    print(f"🔧 Veeva Tool Called: doctor={doctor_name}")
-    
-    # Get latest engagement info from data source
-    engagement_info = veeva_data.get_latest_engagement(doctor_name)
-    
-    return EngagementInfo(
-        doctor=engagement_info["doctor"],
-        last_engagement_date=engagement_info["last_engagement_date"],
-        engagement_type=engagement_info["engagement_type"],
-        outcome=engagement_info["outcome"],
-        talking_points=engagement_info["talking_points"],
-        contacts_made=engagement_info["contacts_made"]
-    )
+    logger.debug("🔧 Veeva Tool Called: doctor=%s", doctor_name)
+    return await _query_veeva_impl(doctor_name)
 
 
 @function_tool
@@ -119,25 +416,22 @@ async def query_knowledge_tool(
 ) -> str:
     """
     🔧 Knowledge Base Tool: Product information and training materials
-    
+
     This tool queries the AWS Bedrock Knowledge Base for:
     - Product features and specifications
     - Clinical studies and evidence
     - Training materials and best practices
     - Competitive information
     - Regulatory and compliance guidance
-    
+
     Args:
         query: Question or topic to search for in the knowledge base
-        
+
     Returns:
         str: Relevant information from the knowledge base
     """
-    print(f"🔧 Knowledge Base Tool Called: query={query}")
-    
-    # Query the knowledge base
-    result = knowledge_base.query(query)
-    return result
+    logger.debug("🔧 Knowledge Base Tool Called: query=%s", query)
+    return await _query_knowledge_impl(query)
 
 
 @function_tool
@@ -147,38 +441,22 @@ async def query_tableau_tool(
 ) -> str:
     """
     🔧 Tableau Tool: Analytics and business intelligence
-    
+
     This tool provides business analytics and insights from Tableau, including:
     - Test ordering trends and growth metrics
     - Regional performance comparisons
     - Customer satisfaction scores
     - Product performance analytics
     - Actionable business insights
-    
+
     Args:
         analysis_type: Type of analysis to perform (trends, regional, insights)
-        
+
     Returns:
         str: Formatted analytics report
     """
-    print(f"🔧 Tableau Tool Called: type={analysis_type}")
-    
-    if analysis_type.lower() == "insights":
-        insights = tableau_data.get_performance_insights()
-        return "\n".join([f"• {insight}" for insight in insights])
-    elif analysis_type.lower() == "regional":
-        regions = tableau_data.get_regional_performance()
-        result = "🌎 Regional Performance Summary:\n\n"
-        for region in regions:
-            result += f"**{region['region']}:**\n"
-            result += f"• Orders: {region['total_orders']:,}\n"
-            result += f"• Revenue: ${region['revenue']:,}\n"  
-            result += f"• Growth: {region['growth']}\n"
-            result += f"• Key Accounts: {region['key_accounts']}\n\n"
-        return result
-    else:
-        # Default to trends analysis
-        return tableau_data.get_analytics_summary()
+    logger.debug("🔧 Tableau Tool Called: type=%s", analysis_type)
+    return await _query_tableau_impl(analysis_type)
 
 
 @function_tool
@@ -188,60 +466,77 @@ async def query_compliance_tool(
 ) -> str:
     """
     🔧 Compliance Tool: Stark Law and regulatory compliance information
-    
+
     This tool provides compliance-related information including:
     - Stark Law spending limits and current status
     - Risk assessments and recommendations
     - Compliance monitoring and alerts
-    
+
     Args:
         doctor_name: Name of the healthcare professional
-        
+
     Returns:
         str: Formatted compliance information and recommendations
     """
-    print(f"🔧 Compliance Tool Called: doctor={doctor_name}")
-    
-    compliance_info = salesforce_data.get_compliance_info(doctor_name)
-    
-    if not compliance_info:
-        return f"No compliance data available for {doctor_name}"
-    
-    compliance = compliance_info[0]  # Get first (should be only) result
-    
-    result = f"**Stark Law Compliance - {compliance['doctor']}:**\n\n"
-    result += f"• Annual Limit: ${compliance['annual_limit']:,}\n"
-    result += f"• Current Spent: ${compliance['current_spent']:,}\n"
-    result += f"• Remaining Budget: ${compliance['remaining']:,}\n"
-    result += f"• Utilization: {compliance['percentage_used']:.1f}%\n"
-    result += f"• Risk Level: {compliance['risk_level']}\n"
-    result += f"• Last Updated: {compliance['last_updated']}\n\n"
-    
-    # Add recommendations based on risk level
-    if compliance['risk_level'] == "High":
-        result += "⚠️ **Recommendations:**\n"
-        result += "• Monitor spending closely\n"
-        result += "• Consider alternative engagement strategies\n"
-        result += "• Consult compliance team before additional activities\n"
-    elif compliance['risk_level'] == "Medium":
-        result += "📊 **Recommendations:**\n"
-        result += "• Regular monitoring recommended\n"
-        result += "• Plan remaining activities carefully\n"
-    else:
-        result += "✅ **Status:**\n"
-        result += "• Compliance status is healthy\n"
-        result += "• Continue with planned activities\n"
-    
-    return result
+    logger.debug("🔧 Compliance Tool Called: doctor=%s", doctor_name)
+    return await _query_compliance_impl(doctor_name)
+
+
+@function_tool
+async def batch_query_tool(
+    ctx: RunContextWrapper[SalesContext],
+    requests: List[BatchToolRequest]
+) -> str:
+    """
+    🔧 Batch Tool: Run several business tools in one call
+
+    Use this for comprehensive questions that need multiple data sources
+    (e.g. orders + engagements + analytics for one doctor). All requested
+    tools run concurrently, so one batch call is much faster than asking
+    for each tool in a separate turn.
+
+    Args:
+        requests: List of {tool, argument} pairs, where tool is one of
+            query_salesforce_tool, query_veeva_tool, query_knowledge_tool,
+            query_tableau_tool, query_compliance_tool
+
+    Returns:
+        str: Combined results, one labeled section per requested tool
+    """
+    logger.debug("🔧 Batch Tool Called: %d requests", len(requests))
+
+    async def run_one(request: BatchToolRequest) -> str:
+        impl = _BATCH_DISPATCH.get(request.tool)
+        if impl is None:
+            return f"Unknown tool: {request.tool}"
+
+        try:
+            result = await (impl(request.argument) if request.argument is not None else impl())
+        except Exception as e:
+            return f"❌ {request.tool} failed: {e}"
+
+        if isinstance(result, BaseModel):
+            return _dump_model_json(result)
+        return str(result)
+
+    results = await asyncio.gather(*(run_one(request) for request in requests))
+
+    sections = [
+        f"### {request.tool}\n{result}"
+        for request, result in zip(requests, results)
+    ]
+    return "\n\n".join(sections)
 
 # Export all tools for easy importing
 __all__ = [
     'query_salesforce_tool',
-    'query_veeva_tool', 
+    'query_veeva_tool',
     'query_knowledge_tool',
     'query_tableau_tool',
     'query_compliance_tool',
+    'batch_query_tool',
     'SalesContext',
     'OrderInfo',
-    'EngagementInfo'
-]
\ No newline at end of file
+    'EngagementInfo',
+    'BatchToolRequest'
+]
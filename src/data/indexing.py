@@ -0,0 +1,30 @@
+"""
+Name indexing helpers - substring lookup tables for doctor-name filters
+Maps every substring of each indexed name to the names containing it, so
+partial-name queries resolve in one dict hit instead of scanning
+"""
+
+from typing import Dict, Iterable, Tuple
+
+
+def build_substring_index(names: Iterable[str]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Build a substring -> matching-names table for pre-lowercased names
+
+    Args:
+        names: Lowercased names to index
+
+    Returns:
+        Dict mapping each substring to the tuple of names containing it
+    """
+    index: Dict[str, set] = {}
+    for name in names:
+        length = len(name)
+        for start in range(length):
+            for end in range(start + 1, length + 1):
+                index.setdefault(name[start:end], set()).add(name)
+    return {substring: tuple(sorted(matched)) for substring, matched in index.items()}
+
+
+# Export utilities
+__all__ = ['build_substring_index']
@@ -0,0 +1,27 @@
+"""
+Lazy data-source proxy - defers dataset construction to first use
+Importing a data module no longer pays for building its indexes and
+summaries; callers that never touch a source never construct it
+"""
+
+import threading
+
+
+class LazySource:
+    """Proxy that builds the wrapped data source on first attribute access"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return getattr(self._instance, name)
+
+
+# Export utilities
+__all__ = ['LazySource']
@@ -3,109 +3,168 @@ Salesforce Data Source - Mock data for sales orders and compliance
 Simulates Salesforce CRM data with realistic business information
 """
 
+import heapq
+import sys
+from collections import Counter
+
+from .indexing import build_substring_index
+from .lazy import LazySource
+from ..utils.caching import TTLCache
 from typing import Dict, List, Any
-from datetime import datetime, timedelta
-import random
+
+# Static mock records, built once at import and shared by every
+# instance - construction no longer re-creates the literal structures
+_MOCK_ORDERS = (
+    {
+        "doctor": "Dr. Sarah Johnson",
+        "order_id": "ORD-001",
+        "status": "On Hold",
+        "product": "Guardant360",
+        "date": "2024-01-15",
+        "amount": 2500,
+        "quantity": 1,
+        "hospital": "General Hospital",
+        "specialty": "Oncology"
+    },
+    {
+        "doctor": "Dr. Julie Martinez",
+        "order_id": "ORD-012",
+        "status": "On Hold", 
+        "product": "Guardant360",
+        "date": "2024-01-21",
+        "amount": 2500,
+        "quantity": 1,
+        "hospital": "Health System North",
+        "specialty": "Oncology"
+    },
+    {
+        "doctor": "Dr. Julie Martinez",
+        "order_id": "ORD-013",
+        "status": "Completed",
+        "product": "Guardant Reveal",
+        "date": "2024-01-18",
+        "amount": 3600,
+        "quantity": 2,
+        "hospital": "Health System North", 
+        "specialty": "Oncology"
+    },
+    {
+        "doctor": "Dr. Ahmed Shafique",
+        "order_id": "ORD-009",
+        "status": "Completed",
+        "product": "Guardant360",
+        "date": "2024-01-20",
+        "amount": 2500,
+        "quantity": 1,
+        "hospital": "Regional Medical Center",
+        "specialty": "Pathology"
+    },
+    {
+        "doctor": "Dr. Ahmed Shafique",
+        "order_id": "ORD-014",
+        "status": "Processing",
+        "product": "GuardantOMNI",
+        "date": "2024-01-25",
+        "amount": 4200,
+        "quantity": 1,
+        "hospital": "Regional Medical Center",
+        "specialty": "Pathology"
+    }
+)
+
+_MOCK_STARK_COMPLIANCE = (
+    {
+        "doctor": "Dr. Ahmed Shafique",
+        "annual_limit": 5000,
+        "current_spent": 3250,
+        "remaining": 1750,
+        "risk_level": "Medium",
+        "percentage_used": 65.0,
+        "last_updated": "2024-01-25"
+    },
+    {
+        "doctor": "Dr. Julie Martinez", 
+        "annual_limit": 3500,
+        "current_spent": 2100,
+        "remaining": 1400,
+        "risk_level": "Low",
+        "percentage_used": 60.0,
+        "last_updated": "2024-01-25"
+    },
+    {
+        "doctor": "Dr. Sarah Johnson",
+        "annual_limit": 6000,
+        "current_spent": 4200,
+        "remaining": 1800,
+        "risk_level": "High", 
+        "percentage_used": 70.0,
+        "last_updated": "2024-01-25"
+    }
+)
+
+# Intern the repeated categorical values so tallies and equality checks
+# compare by pointer identity and duplicates share one heap string
+for _order in _MOCK_ORDERS:
+    for _field in ("status", "product", "specialty", "hospital"):
+        _order[_field] = sys.intern(_order[_field])
+for _compliance in _MOCK_STARK_COMPLIANCE:
+    _compliance["risk_level"] = sys.intern(_compliance["risk_level"])
+
 
 class SalesforceDataSource:
     """Salesforce CRM data source with order and compliance information"""
     
     def __init__(self):
         self.data = self._generate_mock_data()
-    
+
+        # Indexes keyed by pre-lowercased doctor name, built once - lookups
+        # become a dict hit instead of rescanning (and re-lowercasing) every
+        # record on each call
+        self._orders_by_doctor_lc: Dict[str, List[Dict[str, Any]]] = {}
+        for order in self.data["orders"]:
+            self._orders_by_doctor_lc.setdefault(order["doctor"].lower(), []).append(order)
+
+        self._compliance_by_doctor_lc: Dict[str, List[Dict[str, Any]]] = {}
+        for compliance in self.data["stark_compliance"]:
+            self._compliance_by_doctor_lc.setdefault(compliance["doctor"].lower(), []).append(compliance)
+
+        # Substring tables over the index keys, so partial-name queries
+        # ("Johnson", "Dr. Sarah") also resolve in one dict hit
+        self._orders_substr = build_substring_index(self._orders_by_doctor_lc)
+        self._compliance_substr = build_substring_index(self._compliance_by_doctor_lc)
+
+        # Summaries by normalized doctor name. The key comes from LLM
+        # tool arguments - i.e. user input - so the cache is bounded:
+        # unbounded growth on arbitrary names would leak memory in a
+        # long-running server
+        self._summary_cache = TTLCache(maxsize=128, ttl=3600)
+
+    @staticmethod
+    def _lookup_by_doctor(
+        index: Dict[str, List[Dict[str, Any]]],
+        substr_index: Dict[str, tuple],
+        doctor_name: str
+    ) -> List[Dict[str, Any]]:
+        """Resolve a doctor name against an index, exact match first"""
+        name = doctor_name.lower()
+        matches = index.get(name)
+        if matches is not None:
+            return matches
+
+        # Partial names ("Johnson", "Dr. Sarah") hit the substring table,
+        # keeping the original substring-match semantics without a scan
+        return [
+            record
+            for key in substr_index.get(name, ())
+            for record in index[key]
+        ]
+
     def _generate_mock_data(self) -> Dict[str, Any]:
         """Generate realistic mock Salesforce data"""
-        # Generate dates for the last 30 days
-        base_date = datetime(2024, 1, 1)
-        
-        orders = [
-            {
-                "doctor": "Dr. Sarah Johnson",
-                "order_id": "ORD-001",
-                "status": "On Hold",
-                "product": "Guardant360",
-                "date": "2024-01-15",
-                "amount": 2500,
-                "quantity": 1,
-                "hospital": "General Hospital",
-                "specialty": "Oncology"
-            },
-            {
-                "doctor": "Dr. Julie Martinez",
-                "order_id": "ORD-012",
-                "status": "On Hold", 
-                "product": "Guardant360",
-                "date": "2024-01-21",
-                "amount": 2500,
-                "quantity": 1,
-                "hospital": "Health System North",
-                "specialty": "Oncology"
-            },
-            {
-                "doctor": "Dr. Julie Martinez",
-                "order_id": "ORD-013",
-                "status": "Completed",
-                "product": "Guardant Reveal",
-                "date": "2024-01-18",
-                "amount": 3600,
-                "quantity": 2,
-                "hospital": "Health System North", 
-                "specialty": "Oncology"
-            },
-            {
-                "doctor": "Dr. Ahmed Shafique",
-                "order_id": "ORD-009",
-                "status": "Completed",
-                "product": "Guardant360",
-                "date": "2024-01-20",
-                "amount": 2500,
-                "quantity": 1,
-                "hospital": "Regional Medical Center",
-                "specialty": "Pathology"
-            },
-            {
-                "doctor": "Dr. Ahmed Shafique",
-                "order_id": "ORD-014",
-                "status": "Processing",
-                "product": "GuardantOMNI",
-                "date": "2024-01-25",
-                "amount": 4200,
-                "quantity": 1,
-                "hospital": "Regional Medical Center",
-                "specialty": "Pathology"
-            }
-        ]
+        orders = list(_MOCK_ORDERS)
         
         # Stark Law compliance data
-        stark_compliance = [
-            {
-                "doctor": "Dr. Ahmed Shafique",
-                "annual_limit": 5000,
-                "current_spent": 3250,
-                "remaining": 1750,
-                "risk_level": "Medium",
-                "percentage_used": 65.0,
-                "last_updated": "2024-01-25"
-            },
-            {
-                "doctor": "Dr. Julie Martinez", 
-                "annual_limit": 3500,
-                "current_spent": 2100,
-                "remaining": 1400,
-                "risk_level": "Low",
-                "percentage_used": 60.0,
-                "last_updated": "2024-01-25"
-            },
-            {
-                "doctor": "Dr. Sarah Johnson",
-                "annual_limit": 6000,
-                "current_spent": 4200,
-                "remaining": 1800,
-                "risk_level": "High", 
-                "percentage_used": 70.0,
-                "last_updated": "2024-01-25"
-            }
-        ]
+        stark_compliance = list(_MOCK_STARK_COMPLIANCE)
         
         return {
             "orders": orders,
@@ -115,44 +174,43 @@ class SalesforceDataSource:
     def get_doctor_orders(self, doctor_name: str = None) -> List[Dict[str, Any]]:
         """Get orders for a specific doctor or all doctors"""
         if doctor_name:
-            return [
-                order for order in self.data["orders"]
-                if doctor_name.lower() in order["doctor"].lower()
-            ]
+            return self._lookup_by_doctor(self._orders_by_doctor_lc, self._orders_substr, doctor_name)
         return self.data["orders"]
     
     def get_compliance_info(self, doctor_name: str = None) -> List[Dict[str, Any]]:
         """Get Stark Law compliance information"""
         if doctor_name:
-            return [
-                compliance for compliance in self.data["stark_compliance"]
-                if doctor_name.lower() in compliance["doctor"].lower()
-            ]
+            return self._lookup_by_doctor(self._compliance_by_doctor_lc, self._compliance_substr, doctor_name)
         return self.data["stark_compliance"]
     
     def get_order_summary(self, doctor_name: str = None) -> Dict[str, Any]:
         """Get order summary statistics"""
+        cache_key = (doctor_name or "__all__").lower()
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         orders = self.get_doctor_orders(doctor_name)
-        
+
         total_orders = len(orders)
         total_value = sum(order["amount"] for order in orders)
         
-        # Status breakdown
-        status_summary = {}
-        for order in orders:
-            status = order["status"]
-            status_summary[status] = status_summary.get(status, 0) + 1
+        # Status breakdown - Counter runs the tally in C
+        status_summary = dict(Counter(order["status"] for order in orders))
         
-        # Recent orders (last 3)
-        recent_orders = sorted(orders, key=lambda x: x["date"])[-3:]
+        # Recent orders (last 3) - nlargest is O(N log 3) vs sorting the
+        # whole list; reversed to keep the old oldest-first ordering
+        recent_orders = heapq.nlargest(3, orders, key=lambda x: x["date"])[::-1]
         
-        return {
+        summary = {
             "doctor": doctor_name or "All Doctors",
             "total_orders": total_orders,
             "total_value": total_value,
             "status_summary": status_summary,
             "recent_orders": recent_orders
         }
+        self._summary_cache.set(cache_key, summary)
+        return summary
 
-# Global instance for easy import
-salesforce_data = SalesforceDataSource()
\ No newline at end of file
+# Global instance for easy import - built lazily on first use
+salesforce_data = LazySource(SalesforceDataSource)
\ No newline at end of file
@@ -3,6 +3,10 @@ Security Guardrails - PII protection and content filtering
 Implements strict security checks to prevent inappropriate queries and protect sensitive information
 """
 
+import asyncio
+import hashlib
+import logging
+import re
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from agents import (
@@ -15,6 +19,10 @@ from agents import (
     ModelSettings
 )
 
+from ..utils.caching import TTLCache
+
+logger = logging.getLogger(__name__)
+
 
 class SecurityCheckResult(BaseModel):
     """Security analysis result"""
@@ -87,25 +95,82 @@ security_agent = Agent(
 )
 
 
-@input_guardrail
-async def strict_security_guardrail(
+# Unambiguous block phrases from the security agent's prompt, compiled
+# into one alternation per category. Matching here blocks in microseconds
+# instead of a full LLM round trip; anything not caught still goes to the
+# model, so the fast path can only add blocks the LLM would make anyway
+_FAST_BLOCK_PATTERNS = (
+    ('PII request', re.compile(
+        r'phone number|contact number|telephone|email address|contact email'
+        r'|\bssn\b|social security|home address|personal address|mailing address',
+        re.IGNORECASE
+    )),
+    ('Inappropriate content', re.compile(
+        # Arithmetic only behind an explicit "solve/calculate/what is"
+        # lead-in, and only for unambiguous expressions: + and * never
+        # appear inside dates or ratios, but - and / do ("2024-01",
+        # "360/25"), so those two must be whitespace-delimited. Anything
+        # ambiguous falls through to the LLM instead of hard-blocking
+        r'tell me a joke|make me laugh|funny story'
+        r'|(?:what\s+is|solve|calculate|compute)\s+\d+\s*(?:[+*]\s*\d+|\s[-/]\s+\d+)',
+        re.IGNORECASE
+    )),
+)
+
+
+# Verdicts from the security agent keyed by a digest of the normalized
+# input - repeat queries skip the LLM round trip entirely
+_VERDICT_CACHE = TTLCache(maxsize=1024, ttl=3600)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _verdict_key(input_data: str) -> bytes:
+    """Digest of the whitespace-collapsed, lowercased input"""
+    normalized = _WHITESPACE_RE.sub(' ', str(input_data).strip().lower())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+
+def _fast_block_check(input_data: str) -> Optional[str]:
+    """Return the violated policy if the input matches a hard block phrase"""
+    text = str(input_data)
+    for policy, pattern in _FAST_BLOCK_PATTERNS:
+        if pattern.search(text):
+            return policy
+    return None
+
+
+async def _strict_security_check(
     ctx: RunContextWrapper,
     agent: Agent,
     input_data: str
 ) -> GuardrailFunctionOutput:
-    """
-    🛡️ Strict Security Input Guardrail
-    
-    This guardrail runs before the main agent processes the query.
-    It blocks requests that:
-    - Ask for PII (phone, email, SSN)
-    - Request inappropriate content (math, jokes)
-    - Are not business-appropriate
-    
-    Returns GuardrailFunctionOutput with tripwire_triggered=True if blocked.
-    """
-    print("🛡️ Security Guardrail: Analyzing input...")
-    
+    """Plain implementation behind strict_security_guardrail, callable
+    directly so the combined guardrail can compose it with other checks"""
+    logger.debug("Security Guardrail: analyzing input")
+
+    # Deterministic fast path: hard block phrases skip the LLM entirely
+    violated_policy = _fast_block_check(input_data)
+    if violated_policy is not None:
+        logger.debug("Security Check Result: allowed=False (fast path)")
+        return GuardrailFunctionOutput(
+            output_info={
+                "allowed": False,
+                "reasoning": f"Blocked by local keyword screen: {violated_policy}",
+                "violated_policies": [violated_policy]
+            },
+            tripwire_triggered=True
+        )
+
+    cache_key = _verdict_key(input_data)
+    cached = _VERDICT_CACHE.get(cache_key)
+    if cached is not None:
+        logger.debug("Security Check Result: allowed=%s (cached)", cached.allowed)
+        return GuardrailFunctionOutput(
+            output_info=cached.model_dump(),
+            tripwire_triggered=not cached.allowed
+        )
+
     try:
         # Run security analysis
         result = await Runner.run(
@@ -116,16 +181,17 @@ async def strict_security_guardrail(
         
         security_check = result.final_output_as(SecurityCheckResult)
         
-        print(f"🛡️ Security Check Result: allowed={security_check.allowed}")
-        print(f"🛡️ Violations: {security_check.violated_policies}")
-        
+        logger.debug("Security Check Result: allowed=%s", security_check.allowed)
+        logger.debug("Violations: %s", security_check.violated_policies)
+
+        _VERDICT_CACHE.set(cache_key, security_check)
         return GuardrailFunctionOutput(
             output_info=security_check.model_dump(),
             tripwire_triggered=not security_check.allowed
         )
         
     except Exception as e:
-        print(f"❌ Security guardrail error: {e}")
+        logger.error("Security guardrail error: %s", e)
         # Fail-safe: block on error
         return GuardrailFunctionOutput(
             output_info={"error": str(e), "allowed": False},
@@ -133,52 +199,119 @@ async def strict_security_guardrail(
         )
 
 
-@input_guardrail 
-async def pii_protection_guardrail(
+@input_guardrail
+async def strict_security_guardrail(
     ctx: RunContextWrapper,
     agent: Agent,
     input_data: str
 ) -> GuardrailFunctionOutput:
     """
-    🔒 PII Protection Guardrail (Alternative/Additional)
-    
-    Focused specifically on detecting and blocking PII requests.
-    Can be used alongside or instead of the main security guardrail.
-    """
-    print("🔒 PII Protection: Scanning for sensitive data requests...")
+    🛡️ Strict Security Input Guardrail
     
-    # Simple keyword-based PII detection
-    input_lower = str(input_data).lower()
+    This guardrail runs before the main agent processes the query.
+    It blocks requests that:
+    - Ask for PII (phone, email, SSN)
+    - Request inappropriate content (math, jokes)
+    - Are not business-appropriate
     
-    pii_indicators = {
-        'phone': ['phone', 'telephone', 'contact number', 'call'],
-        'email': ['email', '@', 'contact email', 'email address'],
-        'ssn': ['ssn', 'social security', 'social security number'],
-        'address': ['address', 'home address', 'mailing address']
+    Returns GuardrailFunctionOutput with tripwire_triggered=True if blocked.
+    """
+    return await _strict_security_check(ctx, agent, input_data)
+
+
+# PII keyword categories as one alternation with a named group each -
+# covers the same indicators the old per-category lists enumerated
+_PII_KEYWORD_REGEX = re.compile(
+    r'(?P<phone>phone|telephone|contact number|call)'
+    r'|(?P<email>email|@)'
+    r'|(?P<ssn>ssn|social security)'
+    r'|(?P<address>address)',
+    re.IGNORECASE
+)
+
+
+async def _pii_protection_check(
+    ctx: RunContextWrapper,
+    agent: Agent,
+    input_data: str
+) -> GuardrailFunctionOutput:
+    """Plain implementation behind pii_protection_guardrail"""
+    logger.debug("PII Protection: scanning for sensitive data requests")
+
+    # One pass over the input: each named group covers a PII category, so
+    # a single C-level scan replaces the per-category substring loops
+    found = {
+        match.lastgroup
+        for match in _PII_KEYWORD_REGEX.finditer(str(input_data))
     }
-    
-    detected_pii_types = []
-    for pii_type, keywords in pii_indicators.items():
-        if any(keyword in input_lower for keyword in keywords):
-            detected_pii_types.append(pii_type)
-    
+    detected_pii_types = [t for t in ('phone', 'email', 'ssn', 'address') if t in found]
+
     has_pii_request = len(detected_pii_types) > 0
     confidence = 1.0 if has_pii_request else 0.0
-    
-    pii_result = PIIDetectionResult(
-        has_pii_request=has_pii_request,
-        pii_types_detected=detected_pii_types,
-        confidence_score=confidence
-    )
-    
-    print(f"🔒 PII Detection: {detected_pii_types} (confidence: {confidence})")
-    
+
+    logger.debug("PII Detection: %s (confidence: %s)", detected_pii_types, confidence)
+
+    # Build the output dict directly - the flat model round trip
+    # (validate then model_dump) added nothing on this inline path
     return GuardrailFunctionOutput(
-        output_info=pii_result.model_dump(),
+        output_info={
+            "has_pii_request": has_pii_request,
+            "pii_types_detected": detected_pii_types,
+            "confidence_score": confidence
+        },
         tripwire_triggered=has_pii_request
     )
 
 
+@input_guardrail
+async def pii_protection_guardrail(
+    ctx: RunContextWrapper,
+    agent: Agent,
+    input_data: str
+) -> GuardrailFunctionOutput:
+    """
+    🔒 PII Protection Guardrail (Alternative/Additional)
+    
+    Focused specifically on detecting and blocking PII requests.
+    Can be used alongside or instead of the main security guardrail.
+    """
+    return await _pii_protection_check(ctx, agent, input_data)
+
+
+@input_guardrail
+async def combined_security_guardrail(
+    ctx: RunContextWrapper,
+    agent: Agent,
+    input_data: str
+) -> GuardrailFunctionOutput:
+    """
+    🛡️ Combined Security Guardrail
+
+    Runs the cheap keyword PII scan and the LLM security analysis
+    concurrently instead of back to back. A keyword hit answers
+    immediately and cancels the in-flight LLM call; otherwise the LLM
+    verdict is awaited as usual, so latency is bounded by whichever
+    check decides first rather than by their sum.
+    """
+    llm_task = asyncio.create_task(_strict_security_check(ctx, agent, input_data))
+
+    fast_result = await _pii_protection_check(ctx, agent, input_data)
+    if fast_result.tripwire_triggered:
+        llm_task.cancel()
+        return fast_result
+
+    return await llm_task
+
+
+# PII patterns for output scanning, compiled once at module load so the
+# per-response check is just C-level searches
+_OUTPUT_PII_PATTERNS = (
+    ('phone_pattern', re.compile(r'\b\d{3}-\d{3}-\d{4}\b')),  # XXX-XXX-XXXX format
+    ('email_pattern', re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')),
+    ('ssn_pattern', re.compile(r'\b\d{3}-\d{2}-\d{4}\b'))  # XXX-XX-XXXX format
+)
+
+
 @output_guardrail
 async def response_safety_guardrail(
     ctx: RunContextWrapper,
@@ -195,27 +328,19 @@ async def response_safety_guardrail(
     
     This is a secondary safety check on the agent's response.
     """
-    print("🛡️ Output Safety: Scanning response...")
-    
+    logger.debug("Output Safety: scanning response")
+
     output_str = str(output)
-    
-    # Look for potential PII patterns in output
-    pii_patterns = {
-        'phone_pattern': r'\b\d{3}-\d{3}-\d{4}\b',  # XXX-XXX-XXXX format
-        'email_pattern': r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        'ssn_pattern': r'\b\d{3}-\d{2}-\d{4}\b'  # XXX-XX-XXXX format
-    }
-    
-    import re
+
     violations = []
-    for pattern_name, pattern in pii_patterns.items():
-        if re.search(pattern, output_str):
+    for pattern_name, pattern in _OUTPUT_PII_PATTERNS:
+        if pattern.search(output_str):
             violations.append(f"Potential {pattern_name} detected in response")
     
     has_violations = len(violations) > 0
     
     if has_violations:
-        print(f"⚠️ Output Safety Violations: {violations}")
+        logger.warning("Output Safety Violations: %s", violations)
     
     return GuardrailFunctionOutput(
         output_info={
@@ -238,27 +363,30 @@ def create_custom_policy_guardrail(policy_name: str, policy_rules: List[str]):
         Configured guardrail function
     """
     
+    # Build the policy agent once when the guardrail is created - the
+    # instructions and rules are fixed, so rebuilding per request only
+    # re-did string formatting and agent setup
+    policy_agent = Agent(
+        name=f"{policy_name} Policy Checker",
+        instructions=f"""
+        You are checking compliance with {policy_name} policy.
+
+        Policy Rules:
+        {chr(10).join([f"• {rule}" for rule in policy_rules])}
+
+        Analyze the user query and determine if it violates any of these rules.
+        """,
+        output_type=SecurityCheckResult,
+        model="gpt-4o-mini"
+    )
+
     @input_guardrail
     async def custom_policy_guardrail(
         ctx: RunContextWrapper,
         agent: Agent,
         input_data: str
     ) -> GuardrailFunctionOutput:
-        
-        policy_agent = Agent(
-            name=f"{policy_name} Policy Checker",
-            instructions=f"""
-            You are checking compliance with {policy_name} policy.
-            
-            Policy Rules:
-            {chr(10).join([f"• {rule}" for rule in policy_rules])}
-            
-            Analyze the user query and determine if it violates any of these rules.
-            """,
-            output_type=SecurityCheckResult,
-            model="gpt-4o-mini"
-        )
-        
+
         result = await Runner.run(
             policy_agent,
             f"Check this query against {policy_name} policy: '{input_data}'"
@@ -277,7 +405,8 @@ def create_custom_policy_guardrail(policy_name: str, policy_rules: List[str]):
 # Export main components
 __all__ = [
     'strict_security_guardrail',
-    'pii_protection_guardrail', 
+    'pii_protection_guardrail',
+    'combined_security_guardrail', 
     'response_safety_guardrail',
     'create_custom_policy_guardrail',
     'SecurityCheckResult',
@@ -3,127 +3,84 @@ AWS Bedrock Knowledge Base Integration
 Provides access to product information, training materials, and documentation
 """
 
+import asyncio
 import boto3
+import json
+import logging
 import os
-from typing import Optional, Dict, Any
+import re
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import AsyncIterator, Optional, Dict, Any, List, Tuple
+from botocore.auth import SigV4Auth
+from botocore.awsrequest import AWSRequest
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 
-class BedrockKnowledgeBase:
-    """AWS Bedrock Knowledge Base integration for product information"""
-    
-    def __init__(
-        self,
-        knowledge_base_id: Optional[str] = None,
-        model_arn: Optional[str] = None,
-        region_name: Optional[str] = None
-    ):
-        """
-        Initialize Bedrock Knowledge Base client
-        
-        Args:
-            knowledge_base_id: AWS Knowledge Base ID
-            model_arn: ARN of the model to use for retrieval
-            region_name: AWS region name
-        """
-        self.knowledge_base_id = knowledge_base_id or os.getenv(
-            "BEDROCK_KNOWLEDGE_BASE_ID", 
-            "WYAHSIZEAR"
-        )
-        self.model_arn = model_arn or os.getenv(
-            "BEDROCK_MODEL_ARN",
-            "arn:aws:bedrock:us-west-2::foundation-model/anthropic.claude-v2"
-        )
-        self.region_name = region_name or os.getenv("AWS_REGION_NAME", "us-west-2")
-        
-        self.client = None
-        self.available = False
-        
-        self._initialize_client()
-    
-    def _initialize_client(self) -> None:
-        """Initialize the Bedrock client and test connection"""
-        try:
-            self.client = boto3.client(
-                'bedrock-agent-runtime',
-                region_name=self.region_name
-            )
-            
-            # Test connection with a simple query
-            self._test_connection()
-            self.available = True
-            print("✅ Bedrock Knowledge Base initialized successfully")
-            
-        except NoCredentialsError:
-            print("⚠️ AWS credentials not configured. Knowledge Base will use mock responses.")
-            self.available = False
-            
-        except ClientError as e:
-            print(f"⚠️ AWS Bedrock client error: {e}. Knowledge Base will use mock responses.")
-            self.available = False
-            
-        except Exception as e:
-            print(f"⚠️ Failed to initialize Knowledge Base: {e}. Using mock responses.")
-            self.available = False
-    
-    def _test_connection(self) -> None:
-        """Test the Knowledge Base connection with a simple query"""
-        if not self.client:
-            raise Exception("Bedrock client not initialized")
-        
-        test_response = self.client.retrieve_and_generate(
-            input={'text': "What is sales training?"},
-            retrieveAndGenerateConfiguration={
-                'type': 'KNOWLEDGE_BASE',
-                'knowledgeBaseConfiguration': {
-                    'knowledgeBaseId': self.knowledge_base_id,
-                    'modelArn': self.model_arn,
-                }
-            }
-        )
-        
-        if not test_response.get('output', {}).get('text'):
-            raise Exception("Invalid response from Knowledge Base")
-        
-        print("🧪 Knowledge Base connection test successful")
-    
-    def query(self, query: str) -> str:
-        """
-        Query the Knowledge Base
-        
-        Args:
-            query: The question or topic to search for
-            
-        Returns:
-            Response text from the Knowledge Base
-        """
-        if not self.available or not self.client:
-            return self._get_mock_response(query)
-        
-        try:
-            response = self.client.retrieve_and_generate(
-                input={'text': query},
-                retrieveAndGenerateConfiguration={
-                    'type': 'KNOWLEDGE_BASE',
-                    'knowledgeBaseConfiguration': {
-                        'knowledgeBaseId': self.knowledge_base_id,
-                        'modelArn': self.model_arn,
-                    }
-                }
-            )
-            
-            return response['output']['text']
-            
-        except Exception as e:
-            print(f"❌ Knowledge Base query failed: {e}")
-            return self._get_mock_response(query)
-    
-    def _get_mock_response(self, query: str) -> str:
-        """Generate mock responses when Knowledge Base is not available"""
-        query_lower = query.lower()
-        
-        # Product-specific responses
-        if "guardant360" in query_lower:
-            return """
+from ..utils.caching import TTLCache
+from ..utils.http import get_async_client
+
+logger = logging.getLogger(__name__)
+
+
+# Per-request citation capture. A request handler installs a fresh list
+# via begin_source_capture; every KB result recorded on that task (or on
+# tasks it spawns) lands in that list. Unlike the last_knowledge_sources
+# attribute on the shared singleton, nothing here is visible to - or
+# overwritable by - other in-flight requests
+_CITED_SOURCES: ContextVar[Optional[List[str]]] = ContextVar(
+    "kb_cited_sources", default=None
+)
+
+
+def begin_source_capture() -> List[str]:
+    """Install and return a fresh citation list for the current task"""
+    sources: List[str] = []
+    _CITED_SOURCES.set(sources)
+    return sources
+
+
+def record_cited_sources(sources) -> None:
+    """Add cited URIs to the current task's capture list, if one is set"""
+    captured = _CITED_SOURCES.get()
+    if captured is not None:
+        for uri in sources:
+            if uri not in captured:
+                captured.append(uri)
+
+# aioboto3 gives a natively async Bedrock client; without it async
+# callers still work via a worker-thread fallback
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+# orjson parses the multi-KB citation payloads in C; stdlib json is the
+# fallback when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# One boto3 client per region, shared across instances so the connection
+# pool and credential resolution are process-wide rather than per-instance
+_CLIENT_CACHE: Dict[str, Any] = {}
+
+
+# Negative cache: a recent failed connection test leaves a marker file so
+# restarts within the TTL skip the doomed (and slow) Bedrock probe
+_UNAVAILABLE_MARKER = Path(os.getenv(
+    "BEDROCK_KB_UNAVAILABLE_MARKER",
+    "/tmp/bedrock_kb_unavailable"
+))
+_UNAVAILABLE_TTL = 300  # seconds
+
+# Canned product responses for mock mode, stored once as module
+# constants instead of re-allocating the multi-KB literals per call
+_MOCK_PRODUCT_RESPONSES = {
+    "guardant360": """
             **Guardant360 Overview:**
             
             Guardant360 is a comprehensive genomic profiling test for advanced cancer patients. 
@@ -140,10 +97,9 @@ class BedrockKnowledgeBase:
             • Monitors treatment response
             • Detects resistance mutations
             • Supports clinical trial matching
-            """
-        
-        elif "guardant reveal" in query_lower or "reveal" in query_lower:
-            return """
+            """,
+
+    "reveal": """
             **Guardant Reveal Overview:**
             
             Guardant Reveal is a blood-based colorectal cancer screening test.
@@ -158,10 +114,9 @@ class BedrockKnowledgeBase:
             • Non-invasive screening option
             • Increases patient compliance
             • Early stage detection capability
-            """
-        
-        elif "guardantomni" in query_lower or "omni" in query_lower:
-            return """
+            """,
+
+    "omni": """
             **GuardantOMNI Overview:**
             
             GuardantOMNI is a comprehensive 500+ gene panel for research applications.
@@ -171,10 +126,22 @@ class BedrockKnowledgeBase:
             • Research-grade comprehensive profiling
             • Supports biomarker discovery
             • Enables research collaboration
-            """
-        
-        elif any(word in query_lower for word in ["sales", "training", "process"]):
-            return f"""
+            """,
+}
+
+# One scan finds every product mention; the lookup below keeps the
+# original priority order between them
+_MOCK_PRODUCT_RE = re.compile(
+    r'(?P<guardant360>guardant360)'
+    r'|(?P<reveal>guardant reveal|reveal)'
+    r'|(?P<omni>guardantomni|omni)'
+)
+
+_MOCK_TRAINING_RE = re.compile(r'sales|training|process')
+
+# Query-echoing templates: the static bulk lives here as constants and
+# only the small {query} token is interpolated per call
+_MOCK_SALES_TEMPLATE = """
             **Sales Training Materials:**
             
             Training resources and best practices for '{query}' are available in our comprehensive sales training database.
@@ -192,9 +159,8 @@ class BedrockKnowledgeBase:
             • Sales playbooks and scripts
             • Clinical utility presentations
             """
-        
-        else:
-            return f"""
+
+_MOCK_DEFAULT_TEMPLATE = """
             **Knowledge Base Response:**
             
             Information about '{query}' is available in our training materials and product documentation database.
@@ -208,7 +174,523 @@ class BedrockKnowledgeBase:
             
             For specific details, please refer to the complete training materials in the sales knowledge base.
             """
+
+
+
+class BedrockKnowledgeBase:
+    """AWS Bedrock Knowledge Base integration for product information"""
+    
+    def __init__(
+        self,
+        knowledge_base_id: Optional[str] = None,
+        model_arn: Optional[str] = None,
+        region_name: Optional[str] = None,
+        max_pool_connections: int = 50,
+        boto_client: Optional[Any] = None,
+        max_parallel_requests: Optional[int] = None
+    ):
+        """
+        Initialize Bedrock Knowledge Base client
+        
+        Args:
+            knowledge_base_id: AWS Knowledge Base ID
+            model_arn: ARN of the model to use for retrieval
+            region_name: AWS region name
+            max_pool_connections: Size of the HTTP connection pool
+            boto_client: Prebuilt bedrock-agent-runtime client to use
+                instead of constructing (and caching) one per region
+            max_parallel_requests: Concurrency cap for query_many
+        """
+        self.knowledge_base_id = knowledge_base_id or os.getenv(
+            "BEDROCK_KNOWLEDGE_BASE_ID", 
+            "WYAHSIZEAR"
+        )
+        self.model_arn = model_arn or os.getenv(
+            "BEDROCK_MODEL_ARN",
+            "arn:aws:bedrock:us-west-2::foundation-model/anthropic.claude-v2"
+        )
+        self.region_name = region_name or os.getenv("AWS_REGION_NAME", "us-west-2")
+
+        # Pooled keepalive connections reuse warm TLS sessions instead of
+        # paying a handshake per call, and adaptive retries back off under
+        # Bedrock throttling instead of hammering it
+        self.client_config = Config(
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive', 'max_attempts': 5},
+            connect_timeout=5,
+            read_timeout=60
+        )
+        
+        self.client = None
+        # Tri-state: None until the first use triggers initialization
+        self.available = None
+        self._injected_client = boto_client
+
+        # S3 URIs cited by the most recent query (empty in mock mode)
+        self.last_knowledge_sources = []
+
+        # aioboto3 session for async queries, created on first aquery call
+        self._aio_session = None
+
+        # SigV4 signer for the raw-HTTP async path, created on first use -
+        # signing a request ourselves and posting over the shared httpx
+        # client skips botocore's per-call serialization and event hooks
+        self._sigv4: Optional[SigV4Auth] = None
+        self._endpoint = (
+            f"https://bedrock-agent-runtime.{self.region_name}.amazonaws.com"
+            "/retrieveAndGenerate"
+        )
+
+        # Answers keyed by normalized query text - a repeat question
+        # returns in microseconds instead of a multi-second Bedrock call
+        self._query_cache = TTLCache(maxsize=256, ttl=600)
+
+        # Static retrieve_and_generate configuration, built once - only the
+        # input text varies per call
+        self._rag_config = {
+            'type': 'KNOWLEDGE_BASE',
+            'knowledgeBaseConfiguration': {
+                'knowledgeBaseId': self.knowledge_base_id,
+                'modelArn': self.model_arn,
+            }
+        }
+
+        # health_check payload, rebuilt only when the dynamic fields
+        # change - the identity fields never do post-init
+        self._health_cache: Optional[Dict[str, Any]] = None
+        self._health_state = (None, False)
+
+        # Bedrock session reuse, keyed by caller-provided conversation id:
+        # within one conversation the service reuses prior retrieval
+        # context instead of starting each turn cold, while unrelated
+        # conversations never share a session
+        self._session_ids = TTLCache(maxsize=256, ttl=3600)
+
+        # Concurrency cap for batched queries
+        self._query_semaphore = asyncio.Semaphore(
+            max_parallel_requests or (os.cpu_count() or 2) * 5
+        )
+    
+    def _ensure_client(self) -> None:
+        """Initialize on first use - imports stay free of network I/O"""
+        if self.available is None:
+            self._initialize_client()
+
+    @staticmethod
+    def _recently_unavailable() -> bool:
+        """Whether a failed connection test was recorded within the TTL"""
+        try:
+            return time.time() - _UNAVAILABLE_MARKER.stat().st_mtime < _UNAVAILABLE_TTL
+        except OSError:
+            return False
+
+    @staticmethod
+    def _record_unavailable() -> None:
+        """Write (or refresh) the unavailability marker"""
+        try:
+            _UNAVAILABLE_MARKER.touch()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _clear_unavailable() -> None:
+        """Drop the unavailability marker after a successful test"""
+        try:
+            _UNAVAILABLE_MARKER.unlink()
+        except OSError:
+            pass
+
+    def _initialize_client(self) -> None:
+        """Initialize the Bedrock client and test connection"""
+        if self._recently_unavailable():
+            logger.warning("Knowledge Base recently unreachable; using mock responses")
+            self.available = False
+            return
+
+        try:
+            if self._injected_client is not None:
+                self.client = self._injected_client
+            else:
+                client = _CLIENT_CACHE.get(self.region_name)
+                if client is None:
+                    client = boto3.client(
+                        'bedrock-agent-runtime',
+                        region_name=self.region_name,
+                        config=self.client_config
+                    )
+                    _CLIENT_CACHE[self.region_name] = client
+                self.client = client
+            
+            # Optimistically available: the first real query doubles as
+            # the probe, so startup pays no billable RAG call and no RTT
+            self.available = True
+            logger.info("Bedrock Knowledge Base initialized successfully")
+            
+        except NoCredentialsError:
+            logger.warning("AWS credentials not configured; Knowledge Base will use mock responses")
+            self.available = False
+            self._record_unavailable()
+            
+        except ClientError as e:
+            logger.warning("AWS Bedrock client error: %s. Knowledge Base will use mock responses", e)
+            self.available = False
+            self._record_unavailable()
+            
+        except Exception as e:
+            logger.warning("Failed to initialize Knowledge Base: %s. Using mock responses", e)
+            self.available = False
+            self._record_unavailable()
+    
+    def warmup(self) -> bool:
+        """
+        Probe the Knowledge Base with a real query and record the result
+
+        Not called at init - startup stays free of billable calls. Invoke
+        from a health endpoint or a deliberate warmup path when an
+        up-front availability verdict is worth one RAG invocation.
+
+        Returns:
+            True if the Knowledge Base answered the probe
+        """
+        self._ensure_client()
+        if not self.client:
+            return False
+
+        try:
+            self._test_connection()
+            self.available = True
+            self._clear_unavailable()
+            return True
+        except Exception as e:
+            logger.warning("Knowledge Base warmup probe failed: %s", e)
+            self.available = False
+            self._record_unavailable()
+            return False
+
+    def _test_connection(self) -> None:
+        """Test the Knowledge Base connection with a simple query"""
+        if not self.client:
+            raise Exception("Bedrock client not initialized")
+
+        # One attempt only - a dead endpoint should fail in seconds, not
+        # sit through the shared client's adaptive retry schedule
+        test_client = boto3.client(
+            'bedrock-agent-runtime',
+            region_name=self.region_name,
+            config=Config(retries={'max_attempts': 1}, connect_timeout=5, read_timeout=30)
+        )
+        test_response = test_client.retrieve_and_generate(
+            input={'text': "What is sales training?"},
+            retrieveAndGenerateConfiguration=self._rag_config
+        )
+        
+        if not test_response.get('output', {}).get('text'):
+            raise Exception("Invalid response from Knowledge Base")
+        
+        logger.info("Knowledge Base connection test successful")
     
+    def query(self, query: str, conversation_id: Optional[str] = None) -> str:
+        """
+        Query the Knowledge Base
+        
+        Args:
+            query: The question or topic to search for
+            conversation_id: Optional conversation to carry Bedrock
+                retrieval context across turns
+            
+        Returns:
+            Response text from the Knowledge Base
+        """
+        text, sources = self._run_query(query, conversation_id)
+        self.last_knowledge_sources = list(sources)
+        return text
+
+    def _run_query(self, query: str, conversation_id: Optional[str] = None) -> Tuple[str, tuple]:
+        """
+        Run a query and return (text, cited URIs) with no shared state
+
+        Sources stay local to this call, so concurrent queries on the
+        shared singleton cannot swap each other's citations - callers
+        that need them take the returned tuple instead of reading
+        last_knowledge_sources afterwards.
+        """
+        # casefold once; the same normalized form serves as cache key and
+        # as the mock path's pre-lowercased query
+        query_norm = query.strip().casefold()
+
+        self._ensure_client()
+        if not self.available or not self.client:
+            return self._get_mock_response(query, query_norm), ()
+
+        cached = self._query_cache.get(query_norm)
+        if cached is not None:
+            return cached
+
+        try:
+            request_kwargs = {
+                'input': {'text': query},
+                'retrieveAndGenerateConfiguration': self._rag_config
+            }
+            if conversation_id:
+                session_id = self._session_ids.get(conversation_id)
+                if session_id:
+                    request_kwargs['sessionId'] = session_id
+            response = self.client.retrieve_and_generate(**request_kwargs)
+
+            if conversation_id and response.get('sessionId'):
+                self._session_ids.set(conversation_id, response['sessionId'])
+            sources = tuple(self._extract_knowledge_sources(response))
+            text = response['output']['text']
+            self._query_cache.set(query_norm, (text, sources))
+            return text, sources
+
+        except (ClientError, NoCredentialsError) as e:
+            # A stale sessionId also surfaces as a ClientError - drop it so
+            # the next attempt starts a fresh session
+            if conversation_id:
+                self._session_ids.delete(conversation_id)
+            # Auth or endpoint failure on a live call is the availability
+            # probe now - flip to mock mode and negative-cache the verdict
+            logger.warning("Knowledge Base unreachable, switching to mock responses: %s", e)
+            self.available = False
+            self._record_unavailable()
+            return self._get_mock_response(query, query_norm), ()
+
+        except Exception as e:
+            logger.error("Knowledge Base query failed: %s", e)
+            return self._get_mock_response(query, query_norm), ()
+
+    def _get_signer(self) -> Optional[SigV4Auth]:
+        """Lazily build the SigV4 signer from the default credential chain"""
+        if self._sigv4 is None:
+            credentials = boto3.Session().get_credentials()
+            if credentials is None:
+                return None
+            # The credentials object is refreshable; add_auth resolves the
+            # current keys on each signing, so rotation is handled for us
+            self._sigv4 = SigV4Auth(credentials, 'bedrock', self.region_name)
+        return self._sigv4
+
+    async def _asigned_request(
+        self, query: str, conversation_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """POST retrieveAndGenerate directly over the shared httpx client"""
+        payload = {
+            'input': {'text': query},
+            'retrieveAndGenerateConfiguration': self._rag_config
+        }
+        if conversation_id:
+            session_id = self._session_ids.get(conversation_id)
+            if session_id:
+                payload['sessionId'] = session_id
+        # orjson works in bytes end to end: the signed body and the
+        # response both skip a str round trip
+        body = orjson.dumps(payload) if orjson is not None else json.dumps(payload)
+        request = AWSRequest(
+            method='POST',
+            url=self._endpoint,
+            data=body,
+            headers={'Content-Type': 'application/json'}
+        )
+        self._sigv4.add_auth(request)
+
+        response = await get_async_client().post(
+            request.url,
+            content=request.data,
+            headers=dict(request.headers),
+            timeout=60.0
+        )
+        response.raise_for_status()
+        data = orjson.loads(response.content) if orjson is not None else json.loads(response.content)
+        if conversation_id and data.get('sessionId'):
+            self._session_ids.set(conversation_id, data['sessionId'])
+        return data
+
+    async def aquery(self, query: str, conversation_id: Optional[str] = None) -> str:
+        """
+        Query the Knowledge Base without blocking the event loop
+
+        Signs the request ourselves and posts it over the shared pooled
+        httpx client, skipping botocore's per-call overhead entirely.
+        Falls back to aioboto3 when installed (e.g. no static signer), and
+        finally to the synchronous query on a worker thread.
+
+        Args:
+            query: The question or topic to search for
+            conversation_id: Optional conversation to carry Bedrock
+                retrieval context across turns
+
+        Returns:
+            Response text from the Knowledge Base
+        """
+        if self.available is None:
+            # First-use initialization includes a network test; keep it off
+            # the event loop
+            await asyncio.to_thread(self._ensure_client)
+
+        if not self.available:
+            return await asyncio.to_thread(self.query, query, conversation_id)
+
+        query_norm = query.strip().casefold()
+        cached = self._query_cache.get(query_norm)
+        if cached is not None:
+            text, sources = cached
+            self.last_knowledge_sources = list(sources)
+            return text
+
+        try:
+            if self._get_signer() is not None:
+                response = await self._asigned_request(query, conversation_id)
+            elif aioboto3 is not None:
+                if self._aio_session is None:
+                    self._aio_session = aioboto3.Session()
+                async with self._aio_session.client(
+                    'bedrock-agent-runtime',
+                    region_name=self.region_name
+                ) as client:
+                    response = await client.retrieve_and_generate(
+                        input={'text': query},
+                        retrieveAndGenerateConfiguration=self._rag_config
+                    )
+            else:
+                return await asyncio.to_thread(self.query, query)
+
+            self.last_knowledge_sources = self._extract_knowledge_sources(response)
+            text = response['output']['text']
+            self._query_cache.set(query_norm, (text, tuple(self.last_knowledge_sources)))
+            return text
+
+        except Exception as e:
+            logger.error("Knowledge Base query failed: %s", e)
+            self.last_knowledge_sources = []
+            return self._get_mock_response(query, query_norm)
+
+    async def aquery_stream(self, query: str) -> AsyncIterator[str]:
+        """
+        Stream a Knowledge Base answer chunk by chunk
+
+        Uses retrieve_and_generate_stream so the first tokens reach the
+        caller at the model's first-token latency instead of after the
+        full generation. Falls back to yielding the complete non-streaming
+        answer as one chunk when aioboto3 is unavailable or the KB is in
+        mock mode.
+
+        Args:
+            query: The question or topic to search for
+
+        Yields:
+            Response text chunks as Bedrock produces them
+        """
+        if self.available is None:
+            await asyncio.to_thread(self._ensure_client)
+
+        if aioboto3 is None or not self.available:
+            yield await asyncio.to_thread(self.query, query)
+            return
+
+        if self._aio_session is None:
+            self._aio_session = aioboto3.Session()
+
+        self.last_knowledge_sources = []
+        try:
+            async with self._aio_session.client(
+                'bedrock-agent-runtime',
+                region_name=self.region_name
+            ) as client:
+                response = await client.retrieve_and_generate_stream(
+                    input={'text': query},
+                    retrieveAndGenerateConfiguration=self._rag_config
+                )
+
+                async for event in response['stream']:
+                    output = event.get('output')
+                    if output and output.get('text'):
+                        yield output['text']
+                    elif 'citation' in event:
+                        for uri in self._extract_knowledge_sources({'citations': [event['citation']]}):
+                            if uri not in self.last_knowledge_sources:
+                                self.last_knowledge_sources.append(uri)
+
+        except Exception as e:
+            logger.error("Knowledge Base streaming query failed: %s", e)
+            self.last_knowledge_sources = []
+            yield self._get_mock_response(query)
+
+    async def query_many(self, queries: list) -> list:
+        """
+        Run several Knowledge Base queries concurrently
+
+        Latency is bounded by the slowest query instead of the sum of all
+        round trips; a per-instance semaphore caps in-flight calls. Each
+        query's failure is contained by aquery's own fallback, so one bad
+        query never cancels the batch.
+
+        Args:
+            queries: Questions or topics to search for
+
+        Returns:
+            Response texts, in the same order as the queries
+        """
+        async def run_one(query: str) -> str:
+            async with self._query_semaphore:
+                return await self.aquery(query)
+
+        return list(await asyncio.gather(*(run_one(query) for query in queries)))
+
+    @staticmethod
+    def _extract_knowledge_sources(response: Dict[str, Any]) -> list:
+        """Collect the S3 URIs cited in a retrieve_and_generate response"""
+        sources = []
+        for citation in response.get('citations', []):
+            for reference in citation.get('retrievedReferences', []):
+                uri = reference.get('location', {}).get('s3Location', {}).get('uri')
+                if uri and uri not in sources:
+                    sources.append(uri)
+        return sources
+    
+    def _get_mock_response(self, query: str, query_norm: Optional[str] = None) -> str:
+        """Generate mock responses when Knowledge Base is not available"""
+        # casefold handles non-ASCII correctly; reuse the caller's
+        # normalized form when it already paid for one
+        query_lower = query_norm if query_norm is not None else query.casefold()
+
+        # Single pass over the query; priority between products matches the
+        # old elif ordering
+        found = {match.lastgroup for match in _MOCK_PRODUCT_RE.finditer(query_lower)}
+        for key in ("guardant360", "reveal", "omni"):
+            if key in found:
+                return _MOCK_PRODUCT_RESPONSES[key]
+
+        if _MOCK_TRAINING_RE.search(query_lower):
+            return _MOCK_SALES_TEMPLATE.format(query=query)
+
+        return _MOCK_DEFAULT_TEMPLATE.format(query=query)
+    
+    def reset_session(self, conversation_id: Optional[str] = None) -> None:
+        """Drop one conversation's Bedrock session, or all of them"""
+        if conversation_id is not None:
+            self._session_ids.delete(conversation_id)
+        else:
+            self._session_ids.clear()
+
+    def query_with_sources(self, query: str) -> Dict[str, Any]:
+        """
+        Query the Knowledge Base and return the answer with its citations
+
+        Args:
+            query: The question or topic to search for
+
+        Returns:
+            Dict with the response text and the cited S3 URIs
+        """
+        text, sources = self._run_query(query)
+        self.last_knowledge_sources = list(sources)
+        return {
+            "answer": text,
+            "sources": list(sources)
+        }
+
     def get_product_info(self, product_name: str) -> str:
         """Get specific product information"""
         return self.query(f"Tell me about {product_name} features and benefits")
@@ -219,12 +701,19 @@ class BedrockKnowledgeBase:
     
     def health_check(self) -> Dict[str, Any]:
         """Check the health status of the Knowledge Base connection"""
-        return {
-            "available": self.available,
-            "knowledge_base_id": self.knowledge_base_id,
-            "region": self.region_name,
-            "client_initialized": self.client is not None
-        }
+        self._ensure_client()
+        state = (self.available, self.client is not None)
+        if self._health_cache is None or state != self._health_state:
+            # Load balancers poll this every few seconds; reallocating the
+            # same dict each time is pure churn
+            self._health_state = state
+            self._health_cache = {
+                "available": self.available,
+                "knowledge_base_id": self.knowledge_base_id,
+                "region": self.region_name,
+                "client_initialized": state[1]
+            }
+        return self._health_cache
 
 # Global instance for easy import
 knowledge_base = BedrockKnowledgeBase()
\ No newline at end of file
@@ -3,7 +3,10 @@ Model Configuration - OpenAI and Bedrock Claude models only
 Handles model initialization and configuration for different providers
 """
 
+import sys
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 from agents import ModelSettings
@@ -13,7 +16,9 @@ class ModelProvider(Enum):
     OPENAI = "openai"
     BEDROCK = "bedrock"
 
-@dataclass
+# Frozen so configs are hashable and safe to share across cached lookups;
+# slots drop the per-instance __dict__ and speed up attribute reads
+@dataclass(frozen=True, slots=True)
 class ModelConfig:
     """Model configuration container"""
     name: str
@@ -24,12 +29,9 @@ class ModelConfig:
     temperature: float = 0.2
     max_tokens: int = 1500
     
-def get_available_models() -> Dict[str, ModelConfig]:
-    """
-    Get all available model configurations
-    Returns only OpenAI and Bedrock Claude models
-    """
-    return {
+# The full registry, built once at import - accessors hand out this
+# shared dict instead of reconstructing seven configs per call
+_AVAILABLE_MODELS: Dict[str, ModelConfig] = {
         # 🤖 OpenAI Models
         "openai-gpt-4o": ModelConfig(
             name="openai-gpt-4o",
@@ -91,36 +93,57 @@ def get_available_models() -> Dict[str, ModelConfig]:
             temperature=0.1,
             max_tokens=2000
         ),
-    }
+}
+
+# Provider buckets over the same shared configs, also built once
+_MODELS_BY_PROVIDER: Dict[ModelProvider, Dict[str, ModelConfig]] = {}
+for _name, _config in _AVAILABLE_MODELS.items():
+    _MODELS_BY_PROVIDER.setdefault(_config.provider, {})[_name] = _config
+
+
+def get_available_models() -> Dict[str, ModelConfig]:
+    """
+    Get all available model configurations
+    Returns only OpenAI and Bedrock Claude models
+    """
+    return _AVAILABLE_MODELS
 
 def get_model_config(model_name: str) -> Optional[ModelConfig]:
     """Get configuration for a specific model"""
-    available_models = get_available_models()
-    return available_models.get(model_name)
+    return _AVAILABLE_MODELS.get(model_name)
 
+@lru_cache(maxsize=None)
 def get_model_settings(model_config: ModelConfig) -> ModelSettings:
     """Convert ModelConfig to OpenAI Agents SDK ModelSettings"""
     return ModelSettings(
         temperature=model_config.temperature,
-        max_tokens=model_config.max_tokens
+        max_tokens=model_config.max_tokens,
+        # Let the model emit independent tool calls in one turn; the SDK
+        # runner executes them concurrently via asyncio.gather, so
+        # multi-source questions overlap their data-source latency
+        parallel_tool_calls=True
     )
 
 def get_models_by_provider(provider: ModelProvider) -> Dict[str, ModelConfig]:
     """Get all models for a specific provider"""
-    all_models = get_available_models()
-    return {
-        name: config for name, config in all_models.items() 
-        if config.provider == provider
-    }
+    return _MODELS_BY_PROVIDER.get(provider, {})
 
-# Model recommendations for different use cases
-RECOMMENDED_MODELS = {
-    "general": "openai-gpt-4o-mini",  # Best balance of speed/cost/performance
-    "reasoning": "claude-3-5-sonnet",  # Best for complex reasoning
-    "fast": "claude-3-5-haiku",       # Fastest responses
-    "comprehensive": "openai-gpt-4o"   # Most comprehensive responses
-}
+# Provider groupings, computed once at import - the registry is static,
+# so per-render scans with enum compares are wasted work
+OPENAI_MODEL_NAMES = tuple(_MODELS_BY_PROVIDER.get(ModelProvider.OPENAI, ()))
+BEDROCK_MODEL_NAMES = tuple(_MODELS_BY_PROVIDER.get(ModelProvider.BEDROCK, ()))
+
+# Model recommendations for different use cases - read-only mapping of
+# interned names, so downstream equality checks compare by pointer
+RECOMMENDED_MODELS = MappingProxyType({
+    "general": sys.intern("openai-gpt-4o-mini"),  # Best balance of speed/cost/performance
+    "reasoning": sys.intern("claude-3-5-sonnet"),  # Best for complex reasoning
+    "fast": sys.intern("claude-3-5-haiku"),       # Fastest responses
+    "comprehensive": sys.intern("openai-gpt-4o")   # Most comprehensive responses
+})
+
+_DEFAULT_RECOMMENDED = RECOMMENDED_MODELS["general"]
 
 def get_recommended_model(use_case: str = "general") -> str:
     """Get recommended model for specific use case"""
-    return RECOMMENDED_MODELS.get(use_case, "openai-gpt-4o-mini")
\ No newline at end of file
+    return RECOMMENDED_MODELS.get(use_case, _DEFAULT_RECOMMENDED)
\ No newline at end of file
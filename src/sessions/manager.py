@@ -3,12 +3,37 @@ Session Management - Handles conversation persistence and memory
 Provides both persistent (SQLite file) and temporary (in-memory) session strategies
 """
 
-from typing import Dict, Optional, List, Any
+from typing import Dict, Iterator, Optional, List, Any, Tuple
 from agents import SQLiteSession
+from collections import OrderedDict
+from contextlib import contextmanager
 import asyncio
+import json
 import os
+import queue
+import sqlite3
+import threading
+import logging
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+
+# PRAGMA tuning applied to persistent session databases
+# WAL lets readers proceed during writes; NORMAL sync is safe under WAL
+# and avoids an fsync per commit on short chat turns
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=memory",
+)
+
+# Reader pool size - history reads vastly outnumber writes, so give
+# readers one connection per CPU while writes stay on a single connection
+READ_POOL_SIZE = os.cpu_count() or 4
+
 
 class SessionManager:
     """
@@ -20,20 +45,58 @@ class SessionManager:
     - Automatic session lifecycle management
     """
     
-    def __init__(self, db_directory: str = "sessions"):
+    def __init__(self, db_directory: str = "sessions", max_sessions: int = 10000):
         """
         Initialize session manager
         
         Args:
             db_directory: Directory to store persistent session files
+            max_sessions: Cap on cached sessions; least-recently-used
+                entries are evicted beyond this (their files persist)
         """
         self.db_directory = Path(db_directory)
         self.db_directory.mkdir(exist_ok=True)
+        self.max_sessions = max_sessions
         
-        # Active session cache
-        self._sessions: Dict[str, SQLiteSession] = {}
-        
-        print(f"📁 Session Manager initialized with directory: {self.db_directory}")
+        # Active session cache, keyed by (user_id, session_type,
+        # conversation_id) - tuple keys hash component-wise and skip the
+        # per-call f-string concatenation a composite string key needs.
+        # OrderedDict tracks recency so the cache can evict at the cap
+        self._sessions: "OrderedDict[Tuple[str, str, Optional[str]], SQLiteSession]" = OrderedDict()
+
+        # Secondary index from user_id to that user's session keys, so
+        # clearing a user touches only their sessions instead of scanning
+        # the whole cache
+        self._user_index: Dict[str, set] = {}
+
+        # Split read/write connection pools per database file
+        # Readers are read-only and run in parallel under WAL; all writes
+        # funnel through a single connection guarded by a lock
+        self._read_pools: Dict[str, queue.Queue] = {}
+        self._write_conns: Dict[str, sqlite3.Connection] = {}
+        self._write_locks: Dict[str, threading.Lock] = {}
+        self._pools_lock = threading.Lock()
+
+        logger.debug("Session Manager initialized with directory: %s", self.db_directory)
+
+    def _evict_session(self, key: Tuple[str, str, Optional[str]], session: SQLiteSession) -> None:
+        """Release an evicted session's connections and index entry"""
+        user_keys = self._user_index.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_index[key[0]]
+
+        self._close_pools(self.db_directory / f"session_{session.session_id}.db")
+        try:
+            session.close()
+        except Exception as e:
+            logger.warning("Could not close evicted session %s: %s", session.session_id, e)
+
+    @staticmethod
+    def _key_to_str(key: Tuple[str, str, Optional[str]]) -> str:
+        """Stable string form of a session key, for filenames and display"""
+        return "_".join(part for part in key if part)
     
     def get_session(
         self, 
@@ -52,28 +115,146 @@ class SessionManager:
         Returns:
             SQLiteSession: Configured session instance
         """
-        # Create unique session key
-        session_key = f"{user_id}_{session_type}"
-        if conversation_id:
-            session_key += f"_{conversation_id}"
-        
-        # Return existing session if available
-        if session_key in self._sessions:
-            return self._sessions[session_key]
-        
-        # Create new session
+        key = (user_id, session_type, conversation_id)
+
+        # Return existing session if available, refreshing its recency
+        existing = self._sessions.get(key)
+        if existing is not None:
+            self._sessions.move_to_end(key)
+            return existing
+
+        # At capacity, drop the least-recently-used session; persistent
+        # files stay on disk, so a later lookup simply re-opens them
+        while len(self._sessions) >= self.max_sessions:
+            evicted_key, evicted = self._sessions.popitem(last=False)
+            self._evict_session(evicted_key, evicted)
+
+        # The string form is only needed on the create path - for the
+        # session id and the on-disk filename
+        session_key = self._key_to_str(key)
         if session_type == "persistent":
             db_file = self.db_directory / f"session_{session_key}.db"
             session = SQLiteSession(session_key, str(db_file))
-            print(f"📁 Created persistent session: {db_file}")
+            self._tune_database(db_file)
+            logger.debug("Created persistent session: %s", db_file)
         else:
             session = SQLiteSession(session_key)  # In-memory
-            print(f"💾 Created temporary session: {session_key}")
+            logger.debug("Created temporary session: %s", session_key)
         
-        # Cache the session
-        self._sessions[session_key] = session
+        # Cache the session and index it by user
+        self._sessions[key] = session
+        self._user_index.setdefault(user_id, set()).add(key)
         return session
-    
+
+    def _tune_database(self, db_file: Path) -> None:
+        """
+        Apply performance PRAGMAs to a persistent session database
+
+        journal_mode=WAL is stored in the database file itself, so all
+        connections (including those opened internally by SQLiteSession)
+        benefit from readers no longer blocking writers.
+
+        Args:
+            db_file: Path to the session database file
+        """
+        try:
+            conn = sqlite3.connect(str(db_file))
+            try:
+                for pragma in SQLITE_PRAGMAS:
+                    conn.execute(pragma)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning("Could not tune session database %s: %s", db_file, e)
+
+    def _open_connection(self, db_file: Path, read_only: bool = False) -> sqlite3.Connection:
+        """Open a tuned connection to a session database"""
+        mode = "ro" if read_only else "rw"
+        conn = sqlite3.connect(
+            f"file:{db_file}?mode={mode}",
+            uri=True,
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA busy_timeout=5000")
+        if not read_only:
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def read_connection(self, db_file: Path) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection from the reader pool
+
+        Under WAL, pooled readers run in parallel with each other and
+        with the single writer, so concurrent history reads don't queue
+        behind writes.
+
+        Args:
+            db_file: Path to the session database file
+
+        Yields:
+            sqlite3.Connection: Read-only connection (returned to pool)
+        """
+        key = str(db_file)
+        with self._pools_lock:
+            pool = self._read_pools.get(key)
+            if pool is None:
+                pool = queue.Queue(maxsize=READ_POOL_SIZE)
+                for _ in range(READ_POOL_SIZE):
+                    pool.put(self._open_connection(db_file, read_only=True))
+                self._read_pools[key] = pool
+
+        conn = pool.get()
+        try:
+            yield conn
+        finally:
+            pool.put(conn)
+
+    @contextmanager
+    def write_connection(self, db_file: Path) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow the single writer connection for a session database
+
+        All writes are serialized on one connection; BEGIN IMMEDIATE
+        claims the write lock up front so writers never fail mid-transaction.
+
+        Args:
+            db_file: Path to the session database file
+
+        Yields:
+            sqlite3.Connection: Writer connection (transaction committed on exit)
+        """
+        key = str(db_file)
+        with self._pools_lock:
+            lock = self._write_locks.setdefault(key, threading.Lock())
+            conn = self._write_conns.get(key)
+            if conn is None:
+                conn = self._open_connection(db_file, read_only=False)
+                self._write_conns[key] = conn
+
+        with lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def _close_pools(self, db_file: Path) -> None:
+        """Close and drop any pooled connections for a database file"""
+        key = str(db_file)
+        with self._pools_lock:
+            pool = self._read_pools.pop(key, None)
+            writer = self._write_conns.pop(key, None)
+            self._write_locks.pop(key, None)
+
+        if pool is not None:
+            while not pool.empty():
+                pool.get_nowait().close()
+        if writer is not None:
+            writer.close()
+
     async def clear_session(
         self, 
         user_id: str, 
@@ -91,15 +272,17 @@ class SessionManager:
         Returns:
             bool: True if session was cleared, False if not found
         """
-        session_key = f"{user_id}_{session_type}"
-        if conversation_id:
-            session_key += f"_{conversation_id}"
-        
-        if session_key in self._sessions:
-            session = self._sessions[session_key]
+        key = (user_id, session_type, conversation_id)
+        session = self._sessions.pop(key, None)
+        if session is not None:
+            user_keys = self._user_index.get(user_id)
+            if user_keys is not None:
+                user_keys.discard(key)
+                if not user_keys:
+                    del self._user_index[user_id]
             await session.clear_session()
-            del self._sessions[session_key]
-            print(f"🗑️ Cleared session: {session_key}")
+            self._close_pools(self.db_directory / f"session_{session.session_id}.db")
+            logger.debug("Cleared session: %s", session.session_id)
             return True
         
         return False
@@ -114,22 +297,32 @@ class SessionManager:
         Returns:
             int: Number of sessions cleared
         """
+        # The user index makes this O(sessions for this user) rather than
+        # a scan over every cached session
+        sessions_to_clear = [
+            self._sessions.pop(key)
+            for key in self._user_index.pop(user_id, ())
+        ]
+        if not sessions_to_clear:
+            logger.debug("Cleared 0 sessions for user %s", user_id)
+            return 0
+
+        # Overlap the per-session SQLite transactions instead of awaiting
+        # them one at a time; a failed clear is logged, not fatal
+        results = await asyncio.gather(
+            *(session.clear_session() for session in sessions_to_clear),
+            return_exceptions=True
+        )
+
         cleared_count = 0
-        sessions_to_clear = []
-        
-        # Find all sessions for this user
-        for session_key in self._sessions.keys():
-            if session_key.startswith(f"{user_id}_"):
-                sessions_to_clear.append(session_key)
-        
-        # Clear each session
-        for session_key in sessions_to_clear:
-            session = self._sessions[session_key]
-            await session.clear_session()
-            del self._sessions[session_key]
+        for session, result in zip(sessions_to_clear, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to clear session %s: %s", session.session_id, result)
+                continue
+            self._close_pools(self.db_directory / f"session_{session.session_id}.db")
             cleared_count += 1
         
-        print(f"🗑️ Cleared {cleared_count} sessions for user {user_id}")
+        logger.debug("Cleared %d sessions for user %s", cleared_count, user_id)
         return cleared_count
     
     async def get_session_summary(
@@ -150,21 +343,28 @@ class SessionManager:
             Dict containing session summary
         """
         session = self.get_session(user_id, session_type, conversation_id)
-        
+
         # Get all items in session
-        items = await session.get_items()
+        items = await self._get_session_items(session, session_type)
         
-        # Count different message types
-        user_messages = len([item for item in items if item.get("role") == "user"])
-        assistant_messages = len([item for item in items if item.get("role") == "assistant"])
+        # Count everything in one pass - the old per-role comprehensions
+        # walked the list twice and built throwaway filtered lists
+        total_items = user_messages = assistant_messages = 0
+        for item in items:
+            total_items += 1
+            role = item.get("role")
+            if role == "user":
+                user_messages += 1
+            elif role == "assistant":
+                assistant_messages += 1
         
         return {
-            "session_key": f"{user_id}_{session_type}" + (f"_{conversation_id}" if conversation_id else ""),
-            "total_items": len(items),
+            "session_key": self._key_to_str((user_id, session_type, conversation_id)),
+            "total_items": total_items,
             "user_messages": user_messages,
             "assistant_messages": assistant_messages,
             "session_type": session_type,
-            "has_conversation_data": len(items) > 0
+            "has_conversation_data": total_items > 0
         }
     
     def list_active_sessions(self) -> List[str]:
@@ -174,7 +374,7 @@ class SessionManager:
         Returns:
             List of active session keys
         """
-        return list(self._sessions.keys())
+        return [self._key_to_str(key) for key in self._sessions]
     
     async def export_session(
         self, 
@@ -194,7 +394,85 @@ class SessionManager:
             List of all messages in the session
         """
         session = self.get_session(user_id, session_type, conversation_id)
+        return await self._get_session_items(session, session_type)
+
+    async def batch_append(
+        self,
+        user_id: str,
+        items: List[Dict[str, Any]],
+        session_type: str = "persistent",
+        conversation_id: Optional[str] = None
+    ) -> int:
+        """
+        Append multiple items to a session in a single transaction
+
+        Collapses what would otherwise be one commit per item into one
+        executemany + one commit on the writer connection - the dominant
+        cost for short chat turns on WAL SQLite.
+
+        Args:
+            user_id: User identifier
+            items: Message dicts to append (e.g. {"role": ..., "content": ...})
+            session_type: Session type to write to
+            conversation_id: Optional conversation identifier
+
+        Returns:
+            int: Number of items written
+        """
+        if not items:
+            return 0
+
+        session = self.get_session(user_id, session_type, conversation_id)
+
+        if session_type != "persistent":
+            # In-memory sessions have no writer pool; the session's own
+            # accessor already batches into a single transaction
+            await session.add_items(items)
+            return len(items)
+
+        db_file = self.db_directory / f"session_{session.session_id}.db"
+
+        def _write() -> int:
+            with self.write_connection(db_file) as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO agent_sessions (session_id) VALUES (?)",
+                    (session.session_id,)
+                )
+                conn.executemany(
+                    "INSERT INTO agent_messages (session_id, message_data) VALUES (?, ?)",
+                    [(session.session_id, json.dumps(item)) for item in items]
+                )
+            return len(items)
+
+        return await asyncio.to_thread(_write)
+
+    async def _get_session_items(self, session: SQLiteSession, session_type: str) -> List[Dict[str, Any]]:
+        """
+        Read all items for a session, preferring the pooled read path
+
+        Persistent sessions are read through the read-only connection
+        pool so concurrent reads parallelize; temporary (in-memory)
+        sessions fall back to the session's own accessor.
+        """
+        if session_type == "persistent":
+            db_file = self.db_directory / f"session_{session.session_id}.db"
+            if db_file.exists():
+                try:
+                    return await asyncio.to_thread(self._read_items_direct, session.session_id, db_file)
+                except sqlite3.Error as e:
+                    logger.warning("Pooled read failed for %s: %s", session.session_id, e)
+
         return await session.get_items()
+
+    def _read_items_direct(self, session_key: str, db_file: Path) -> List[Dict[str, Any]]:
+        """Read message items straight from the database via the read pool"""
+        with self.read_connection(db_file) as conn:
+            rows = conn.execute(
+                "SELECT message_data FROM agent_messages WHERE session_id = ? ORDER BY id",
+                (session_key,)
+            ).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
     
     def get_session_file_path(self, user_id: str, conversation_id: Optional[str] = None) -> Path:
         """
@@ -207,10 +485,7 @@ class SessionManager:
         Returns:
             Path to the session database file
         """
-        session_key = f"{user_id}_persistent"
-        if conversation_id:
-            session_key += f"_{conversation_id}"
-        
+        session_key = self._key_to_str((user_id, "persistent", conversation_id))
         return self.db_directory / f"session_{session_key}.db"
     
     def cleanup_old_sessions(self, days_old: int = 30) -> int:
@@ -228,11 +503,17 @@ class SessionManager:
         removed_count = 0
         cutoff_time = time.time() - (days_old * 24 * 60 * 60)
         
-        for db_file in self.db_directory.glob("session_*.db"):
-            if db_file.stat().st_mtime < cutoff_time:
-                db_file.unlink()
-                removed_count += 1
-                print(f"🗑️ Removed old session file: {db_file}")
+        # scandir reuses the stat data the directory read already fetched
+        # where the platform supports it - one syscall per file instead of
+        # a separate stat, and no intermediate Path objects
+        with os.scandir(self.db_directory) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("session_") and entry.name.endswith(".db")):
+                    continue
+                if entry.stat(follow_symlinks=False).st_mtime < cutoff_time:
+                    os.unlink(entry.path)
+                    removed_count += 1
+                    logger.debug("Removed old session file: %s", entry.path)
         
         return removed_count
 
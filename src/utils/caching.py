@@ -0,0 +1,72 @@
+"""
+Caching utilities - small in-process TTL/LRU cache
+Shared by the API server and data-source layers for short-lived memoization
+"""
+
+from typing import Any, Hashable, Optional
+from collections import OrderedDict
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with per-entry time-to-live
+
+    Least-recently-used entries are evicted once maxsize is reached.
+    Thread-safe, so it can be shared between request handlers.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of entries before LRU eviction
+            ttl: Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[Any]:
+        """Get a cached value, or default if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return default
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value under key with the configured TTL"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop a single entry if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Export utilities
+__all__ = ['TTLCache']
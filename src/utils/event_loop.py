@@ -0,0 +1,72 @@
+"""
+Event Loop Utilities - Persistent background event loop management
+Avoids the per-call cost of asyncio.run() by reusing a single long-lived loop
+"""
+
+from typing import Any, Coroutine, Optional
+import asyncio
+import threading
+
+# Prefer uvloop's libuv-based event loop when available (Linux/macOS)
+try:
+    import uvloop
+    uvloop.install()
+    UVLOOP_ENABLED = True
+except ImportError:
+    UVLOOP_ENABLED = False
+
+# Module-level singleton loop and its guard
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get (or lazily create) the shared background event loop
+
+    The loop runs forever on a daemon thread and is reused for all
+    coroutine submissions, avoiding per-request loop setup/teardown.
+
+    Returns:
+        asyncio.AbstractEventLoop: The shared running loop
+    """
+    global _background_loop
+
+    if _background_loop is not None:
+        return _background_loop
+
+    with _loop_lock:
+        # Double-checked: another thread may have created it
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="sales-assistant-event-loop",
+                daemon=True
+            )
+            thread.start()
+            _background_loop = loop
+            print(f"🔄 Background event loop started (uvloop={'enabled' if UVLOOP_ENABLED else 'disabled'})")
+
+    return _background_loop
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """
+    Run a coroutine on the shared background loop and wait for its result
+
+    Drop-in replacement for asyncio.run() in synchronous callers
+    (HTTP handlers, Streamlit callbacks) without creating a fresh loop.
+
+    Args:
+        coro: Coroutine to execute
+
+    Returns:
+        The coroutine's result
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+    return future.result()
+
+
+# Export utilities
+__all__ = ['get_background_loop', 'run_sync', 'UVLOOP_ENABLED']
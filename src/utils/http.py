@@ -0,0 +1,71 @@
+"""
+HTTP client utilities - shared pooled clients for outbound calls
+One async client and one sync session per process, so every tool call
+reuses warm connections instead of paying TCP/TLS setup per request
+"""
+
+from typing import Optional
+import threading
+
+import httpx
+import requests
+
+# Connection pool sizing shared by both clients
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_TIMEOUT = 30.0
+
+_async_client: Optional[httpx.AsyncClient] = None
+_sync_session: Optional[requests.Session] = None
+_client_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the shared pooled httpx.AsyncClient (lazily created)
+
+    Returns:
+        httpx.AsyncClient: Process-wide client with keepalive pooling
+    """
+    global _async_client
+
+    if _async_client is None:
+        with _client_lock:
+            if _async_client is None:
+                _async_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+                    ),
+                    timeout=DEFAULT_TIMEOUT
+                )
+
+    return _async_client
+
+
+def get_sync_session() -> requests.Session:
+    """
+    Get the shared requests.Session for synchronous callers
+
+    Returns:
+        requests.Session: Process-wide session with keepalive pooling
+    """
+    global _sync_session
+
+    if _sync_session is None:
+        with _client_lock:
+            if _sync_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    pool_maxsize=MAX_CONNECTIONS
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _sync_session = session
+
+    return _sync_session
+
+
+# Export utilities
+__all__ = ['get_async_client', 'get_sync_session']
@@ -0,0 +1,98 @@
+"""
+Knowledge Base reference utilities
+Resolves Bedrock citation locations into shareable document links
+"""
+
+import logging
+from functools import lru_cache
+from typing import Dict, List
+
+from .caching import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Presigned links stay valid for an hour - long enough for a chat session
+PRESIGNED_URL_TTL = 3600
+
+# Presigned URLs keyed by (bucket, key) - the KB cites the same few
+# documents across most queries, so repeats skip the HMAC signing.
+# Cache entries expire 5 minutes before the URL itself does, so a
+# cached link always has usable life left
+_URL_CACHE = TTLCache(maxsize=2048, ttl=PRESIGNED_URL_TTL - 300)
+
+# Fully resolved reference dicts keyed by the citation set - most
+# queries cite one of a handful of recurring source combinations, so
+# the parse loop itself is skipped on repeats
+_REFS_CACHE = TTLCache(maxsize=256, ttl=PRESIGNED_URL_TTL - 300)
+
+
+@lru_cache(maxsize=1)
+def _s3_client():
+    """Build the S3 client once, on first reference lookup
+
+    boto3 and its client construction cost a few hundred ms; deferring
+    the import keeps that off module import, and processes that never
+    resolve a reference (mock mode) never pay it at all.
+    """
+    import boto3
+    return boto3.client('s3')
+
+
+def get_references_dict_from_knowledge_sources(knowledge_sources: List[str]) -> Dict[str, str]:
+    """
+    Build a {document name: presigned URL} dict from citation S3 URIs
+
+    Args:
+        knowledge_sources: S3 URIs collected from Bedrock citations
+
+    Returns:
+        Dict mapping document file names to presigned HTTPS URLs
+    """
+    if not knowledge_sources:
+        return {}
+
+    sources_key = tuple(knowledge_sources)
+    cached = _REFS_CACHE.get(sources_key)
+    if cached is not None:
+        return dict(cached)
+
+    s3_client = _s3_client()
+    references: Dict[str, str] = {}
+
+    # Citations frequently repeat the same document; dedupe before
+    # signing so each distinct URI pays the SigV4 HMAC work once
+    for uri in dict.fromkeys(knowledge_sources):
+        if not uri.startswith("s3://"):
+            continue
+
+        bucket, _, key = uri[5:].partition("/")
+        if not key:
+            continue
+
+        document_name = key.rsplit("/", 1)[-1]
+        if document_name in references:
+            continue
+
+        cache_key = (bucket, key)
+        url = _URL_CACHE.get(cache_key)
+        if url is not None:
+            references[document_name] = url
+            continue
+
+        try:
+            url = s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': bucket, 'Key': key},
+                ExpiresIn=PRESIGNED_URL_TTL
+            )
+            _URL_CACHE.set(cache_key, url)
+            references[document_name] = url
+        except Exception as e:
+            logger.warning("Could not presign reference %s: %s", uri, e)
+
+    _REFS_CACHE.set(sources_key, references)
+    return dict(references)
+
+
+# Export utilities
+__all__ = ['get_references_dict_from_knowledge_sources']
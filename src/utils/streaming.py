@@ -3,16 +3,22 @@ Streaming utilities and helpers
 Provides additional streaming functionality and response processing
 """
 
-from typing import AsyncGenerator, Dict, Any, Optional
+from typing import AsyncGenerator, Dict, Any, List, Optional
 from agents import Runner
 from openai.types.responses import ResponseTextDeltaEvent
 import asyncio
 
+# Exact-type pointer compare for the per-token filter - isinstance
+# against the pydantic class walks the MRO on every event
+_DELTA_CLS = ResponseTextDeltaEvent
+
 
 class StreamingResponseProcessor:
     """Processes streaming responses with additional features"""
     
-    def __init__(self, buffer_size: int = 100):
+    def __init__(self, buffer_size: int = 512):
+        # Larger default batches more deltas per yield - each yield is an
+        # event-loop round trip to the consumer
         self.buffer_size = buffer_size
         self.response_buffer = ""
     
@@ -43,21 +49,26 @@ class StreamingResponseProcessor:
                 session=session
             )
             
-            chunk_buffer = ""
-            
+            # Accumulate deltas in a list and join once per flush -
+            # repeated str += reallocates the whole buffer every append
+            chunk_buffer: List[str] = []
+            buffered_len = 0
+
             async for event in result.stream_events():
-                if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                if event.type == "raw_response_event" and type(event.data) is _DELTA_CLS:
                     chunk = event.data.delta
-                    chunk_buffer += chunk
+                    chunk_buffer.append(chunk)
+                    buffered_len += len(chunk)
                     
                     # Yield buffered chunks
-                    if len(chunk_buffer) >= self.buffer_size:
-                        yield chunk_buffer
-                        chunk_buffer = ""
+                    if buffered_len >= self.buffer_size:
+                        yield "".join(chunk_buffer)
+                        chunk_buffer.clear()
+                        buffered_len = 0
             
             # Yield remaining buffer
             if chunk_buffer:
-                yield chunk_buffer
+                yield "".join(chunk_buffer)
                 
         except Exception as e:
             yield f"❌ **Streaming Error**: {str(e)}"